@@ -0,0 +1,146 @@
+import os
+import re
+import shutil
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+LOCK_FILE = ".lock"
+
+
+def _link_or_copy(src, dest) -> None:
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copyfile(src, dest)
+
+
+class AudioCache:
+    """Disk-budgeted LRU cache of downloaded audio files.
+
+    Files are keyed by video ID and audio format. Callers never read cached
+    files in place: :meth:`fetch` hard-links (or copies) the entry to a path
+    the caller owns, so an eviction by another thread or process cannot pull a
+    file out from under a running transcription. Updates are serialized with
+    a lock file so several processes can share one cache directory.
+
+    Parameters
+    ----------
+    root : str or Path
+        Cache directory.
+    max_bytes : int
+        Total disk budget. Least recently used entries are evicted to stay
+        under it; files larger than the budget are not cached.
+    """
+
+    def __init__(self, root, max_bytes: int):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.bytes_saved = 0
+
+    def path_for(self, video_id: str, fmt: str) -> Path:
+        safe_id = re.sub(r"[^A-Za-z0-9_-]", "_", video_id)
+        return self.root / f"{safe_id}.{fmt}"
+
+    @contextmanager
+    def _locked(self):
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.root / LOCK_FILE, "a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def fetch(self, video_id: str, fmt: str, dest) -> bool:
+        """Place the cached audio for ``video_id`` at ``dest`` if present."""
+        path = self.path_for(video_id, fmt)
+        with self._locked():
+            if not path.is_file():
+                self.misses += 1
+                return False
+            if os.path.exists(dest):
+                os.remove(dest)
+            _link_or_copy(path, dest)
+            # Mark as recently used for LRU eviction
+            os.utime(path)
+            self.hits += 1
+            self.bytes_saved += path.stat().st_size
+        return True
+
+    def put(self, video_id: str, fmt: str, src) -> bool:
+        """Store a copy of ``src`` for ``video_id``; ``src`` is left in place."""
+        size = os.path.getsize(src)
+        if size > self.max_bytes:
+            return False
+        path = self.path_for(video_id, fmt)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with self._locked():
+            _link_or_copy(src, tmp)
+            os.replace(tmp, path)
+            # A hard link shares its mtime with src; reset it so LRU sees a fresh entry
+            os.utime(path)
+            self.stores += 1
+            self._evict()
+        return True
+
+    def _entries(self):
+        for entry in os.scandir(self.root):
+            if entry.is_file() and not entry.name.startswith("."):
+                yield entry
+
+    def _evict(self) -> None:
+        entries = []
+        for entry in self._entries():
+            st = entry.stat()
+            entries.append((st.st_mtime, st.st_size, entry.path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        """Return hit rate, bytes saved and current disk usage."""
+        with self._locked():
+            lookups = self.hits + self.misses
+            entries = 0
+            stored_bytes = 0
+            for entry in self._entries():
+                try:
+                    stored_bytes += entry.stat().st_size
+                except FileNotFoundError:
+                    # Removed by a process not honouring the lock file
+                    continue
+                entries += 1
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "bytes_saved": self.bytes_saved,
+                "stores": self.stores,
+                "evictions": self.evictions,
+                "entries": entries,
+                "stored_bytes": stored_bytes,
+                "max_bytes": self.max_bytes,
+            }
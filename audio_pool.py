@@ -0,0 +1,96 @@
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from scheduling import QueueFull
+
+
+def _timed_call(fn, args, kwargs):
+    """Run ``fn`` in a worker process and report when it started and ended."""
+    started = time.time()
+    result = fn(*args, **kwargs)
+    return started, time.time(), result
+
+
+class AudioPool:
+    """Process pool for the CPU-heavy audio stage in server mode.
+
+    Downloading and ffmpeg post-processing run in separate processes so they
+    do not compete for the GIL with the HTTP and MCP loops. The pool has its
+    own queue limit, independent of the scheduler's concurrency limits.
+
+    Parameters
+    ----------
+    workers : int, optional
+        Number of worker processes. Defaults to the CPU count.
+    max_queue : int
+        Jobs allowed to wait for a free worker before :class:`QueueFull` is
+        raised.
+    """
+
+    def __init__(self, workers: int | None = None, *, max_queue: int = 16):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        # spawn avoids forking a process that is running server threads
+        self._executor = ProcessPoolExecutor(
+            self.workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._busy_seconds = 0.0
+        self._waits: deque = deque(maxlen=1000)
+        self._started = time.time()
+
+    def run(self, fn, *args, **kwargs):
+        """Run ``fn(*args, **kwargs)`` in a worker process and return its result."""
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self._rejected += 1
+                raise QueueFull("The audio processing queue is full")
+            self._pending += 1
+        submitted = time.time()
+        try:
+            started, ended, result = self._executor.submit(
+                _timed_call, fn, args, kwargs
+            ).result()
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+                self._failed += 1
+            raise
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+            self._busy_seconds += ended - started
+            self._waits.append(max(0.0, started - submitted))
+        return result
+
+    def stats(self) -> dict:
+        """Return pool utilization and queue wait statistics."""
+        with self._lock:
+            waits = sorted(self._waits)
+            uptime = max(time.time() - self._started, 1e-9)
+            return {
+                "workers": self.workers,
+                "in_flight": min(self._pending, self.workers),
+                "queue_depth": max(0, self._pending - self.workers),
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "utilization": round(self._busy_seconds / (self.workers * uptime), 4),
+                "wait_avg_seconds": round(sum(waits) / len(waits), 4) if waits else 0.0,
+                "wait_p95_seconds": (
+                    round(waits[min(len(waits) - 1, int(len(waits) * 0.95))], 4)
+                    if waits
+                    else 0.0
+                ),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from recipes import Recipe
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    # A unique temp file per call, so threads writing the same path don't race
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class RecipeStore:
+    """On-disk corpus of transcripts and the recipes derived from them.
+
+    Each URL gets a directory named after a hash of the URL holding
+    ``meta.json``, the combined ``transcript.txt`` fed to the model, the raw
+    Whisper transcript ``spoken.txt`` when one was made and one
+    ``recipe-<language>.json`` per output language. Recipes record the
+    extraction version (prompt and schema hash) that produced them so stale
+    ones can be re-derived without downloading or transcribing again.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _dir(self, url: str) -> Path:
+        return self.root / hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+
+    def save_transcript(self, url: str, transcript: str, spoken: str | None = None) -> None:
+        d = self._dir(url)
+        d.mkdir(exist_ok=True)
+        _write_atomic(d / "meta.json", json.dumps({"url": url}, ensure_ascii=False))
+        if spoken is not None:
+            _write_atomic(d / "spoken.txt", spoken)
+        _write_atomic(d / "transcript.txt", transcript)
+
+    def load_transcript(self, url: str) -> str | None:
+        try:
+            return (self._dir(url) / "transcript.txt").read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def load_spoken_transcript(self, url: str) -> str | None:
+        """Return the raw Whisper transcript, or ``None`` if captions were used."""
+        try:
+            return (self._dir(url) / "spoken.txt").read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def save_recipe(self, url: str, language: str, recipe: Recipe, version: str) -> None:
+        d = self._dir(url)
+        d.mkdir(exist_ok=True)
+        doc = {
+            "url": url,
+            "language": language,
+            "version": version,
+            "extracted_at": time.time(),
+            "recipe": recipe.to_dict(),
+        }
+        _write_atomic(d / f"recipe-{language}.json", json.dumps(doc, ensure_ascii=False))
+
+    def load_recipe(self, url: str, language: str) -> tuple[Recipe, str] | None:
+        """Return ``(recipe, version)`` for ``url`` or ``None`` if not stored."""
+        try:
+            doc = json.loads((self._dir(url) / f"recipe-{language}.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return Recipe.from_dict(doc["recipe"]), doc.get("version")
+
+    def entries(self):
+        """Yield ``(url, {language: version})`` for every stored transcript."""
+        for d in sorted(self.root.iterdir()):
+            if not (d / "transcript.txt").is_file():
+                continue
+            try:
+                url = json.loads((d / "meta.json").read_text(encoding="utf-8"))["url"]
+            except (OSError, ValueError, KeyError):
+                continue
+            versions = {}
+            for path in d.glob("recipe-*.json"):
+                try:
+                    doc = json.loads(path.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    doc = {}
+                versions[path.stem[len("recipe-"):]] = doc.get("version")
+            yield url, versions
+
+    def stale(self, version: str, languages=None):
+        """Yield ``(url, language)`` pairs whose recipe is not at ``version``.
+
+        Without ``languages`` every language already stored for a URL is
+        checked; otherwise the given languages are, including ones never
+        extracted.
+        """
+        for url, versions in self.entries():
+            for language in languages or sorted(versions):
+                if versions.get(language) != version:
+                    yield url, language
+
+
+def rederive(
+    store: RecipeStore,
+    extract,
+    version: str,
+    *,
+    languages=None,
+    concurrency: int = 4,
+    budget: float | None = None,
+    spent=lambda: 0.0,
+    limit: int | None = None,
+) -> dict:
+    """Re-run only the LLM stage for stale recipes in ``store``.
+
+    Parameters
+    ----------
+    extract : callable
+        ``extract(transcript, language)`` returning the model's recipe JSON.
+    version : str
+        Current extraction version; recipes at another version are stale.
+    concurrency : int
+        Number of extractions running at once.
+    budget : float, optional
+        Stop starting new extractions once ``spent()`` has grown by this much.
+    spent : callable
+        Returns the running spend, e.g. the model router's total cost.
+    limit : int, optional
+        Re-derive at most this many recipes.
+
+    Returns a report with ``stale``, ``updated``, ``failed`` and ``skipped``
+    counts and the amount ``spent``.
+    """
+    concurrency = max(1, concurrency)
+    todo = deque(store.stale(version, languages))
+    if limit is not None:
+        todo = deque(list(todo)[:limit])
+    report = {"stale": len(todo), "updated": 0, "failed": 0, "skipped": 0, "spent": 0.0}
+    total = len(todo)
+    start = spent()
+
+    def work(url, language):
+        transcript = store.load_transcript(url)
+        recipe = Recipe.from_json(extract(transcript, language))
+        store.save_recipe(url, language, recipe, version)
+
+    print(f"🔁 Re-deriving {total} stale recipe(s) at version {version}")
+    with ThreadPoolExecutor(concurrency) as pool:
+        pending = {}
+        while todo or pending:
+            while todo and len(pending) < concurrency:
+                if budget is not None and spent() - start >= budget:
+                    print(f"💸 Budget of ${budget:.2f} exhausted; skipping {len(todo)} recipe(s)")
+                    report["skipped"] += len(todo)
+                    todo.clear()
+                    break
+                url, language = todo.popleft()
+                pending[pool.submit(work, url, language)] = (url, language)
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                url, language = pending.pop(future)
+                if future.exception() is None:
+                    report["updated"] += 1
+                    status = "✅"
+                else:
+                    report["failed"] += 1
+                    status = f"❌ {future.exception()}"
+                finished = report["updated"] + report["failed"]
+                print(f"[{finished}/{total}] {url} ({language}) {status} - ${spent() - start:.4f} spent")
+
+    report["spent"] = round(spent() - start, 6)
+    return report
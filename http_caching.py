@@ -0,0 +1,81 @@
+import gzip
+import hashlib
+from functools import lru_cache
+
+try:
+    import brotli
+except Exception:  # pragma: no cover - optional dependency
+    brotli = None
+
+DEFAULT_CACHE_CONTROL = "public, max-age=3600"
+
+# Bodies smaller than this are not worth the compression overhead
+MIN_COMPRESS_SIZE = 256
+
+
+def supported_encodings() -> tuple[str, ...]:
+    """Return content codings the server can produce, most preferred first."""
+    return ("br", "gzip") if brotli else ("gzip",)
+
+
+def make_etag(body: bytes, encoding: str | None = None) -> str:
+    """Return a strong ETag for ``body``, suffixed with its content coding."""
+    digest = hashlib.sha256(body).hexdigest()[:32]
+    return f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+
+
+def _etag_base(tag: str) -> str:
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    tag = tag.strip('"')
+    return tag.split("-", 1)[0]
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weakly compare an ``If-None-Match`` header value against ``etag``.
+
+    Content-coding suffixes are ignored so a client holding the gzip variant
+    still gets a ``304`` when it revalidates without ``Accept-Encoding``.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    base = _etag_base(etag)
+    return any(_etag_base(tag) == base for tag in if_none_match.split(","))
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """Pick the best supported content coding from an ``Accept-Encoding`` header."""
+    if not accept_encoding:
+        return None
+    supported = supported_encodings()
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+    best, best_q = None, 0.0
+    for name in supported:
+        q = weights.get(name, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+@lru_cache(maxsize=256)
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress ``body`` deterministically so repeat hits reuse the result."""
+    if encoding == "gzip":
+        return gzip.compress(body, mtime=0)
+    if encoding == "br" and brotli:
+        return brotli.compress(body)
+    raise ValueError(f"Unsupported content coding: {encoding}")
@@ -0,0 +1,212 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# USD per million tokens as (input, output); unknown models are costed at 0
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+
+
+class ModelStats:
+    """Latency, cost and failure counters for one model."""
+
+    def __init__(self, window: int = 500):
+        self.calls = 0
+        self.failures = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.fallbacks = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+        self.latencies: deque = deque(maxlen=window)
+
+    def percentile(self, p: float) -> float | None:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+    def snapshot(self) -> dict:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "fallbacks": self.fallbacks,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cost_usd": round(self.cost, 6),
+            "latency_p50_seconds": self.percentile(0.5),
+            "latency_p95_seconds": self.percentile(0.95),
+        }
+
+
+class ModelRouter:
+    """Pick a chat model per request, hedge slow calls and fall back on errors.
+
+    Interactive requests go to ``default_model``; when a call takes longer
+    than the model's ``hedge_percentile`` latency a duplicate request is sent
+    and whichever answers first wins. Bulk requests use ``bulk_model`` and are
+    never hedged. Transcripts longer than ``long_transcript_chars`` are routed
+    to ``long_transcript_model``. If the chosen model fails, the request is
+    retried once on the other model with the same arguments, so the response
+    schema is unchanged.
+
+    Parameters
+    ----------
+    create : callable
+        Function performing the chat completion, called as
+        ``create(model=..., timeout=..., **kwargs)``. Normally
+        ``openai.chat.completions.create``; tests pass a fake, and the OpenAI
+        client can be pointed at a local endpoint with ``OPENAI_BASE_URL``.
+    hedge_percentile : float
+        Latency percentile after which a hedged duplicate is sent.
+    min_samples : int
+        Samples needed before the percentile is trusted; until then
+        ``default_hedge_delay`` is used.
+    timeout : float
+        Per-call timeout in seconds passed to ``create``.
+    max_workers : int
+        Threads for primary and hedged calls. Each concurrent extraction may
+        need two, so size it as twice the scheduler's workers (see
+        :meth:`resize`); otherwise calls wait for a thread and hedges fire
+        late.
+    """
+
+    def __init__(
+        self,
+        create,
+        *,
+        default_model: str = "gpt-4o-mini",
+        fallback_model: str = "gpt-4o",
+        bulk_model: str = "gpt-4o-mini",
+        long_transcript_model: str = "gpt-4o",
+        long_transcript_chars: int = 60000,
+        hedge_percentile: float = 0.95,
+        min_samples: int = 20,
+        default_hedge_delay: float = 20.0,
+        timeout: float = 120.0,
+        max_workers: int = 8,
+    ):
+        self.create = create
+        self.default_model = default_model
+        self.fallback_model = fallback_model
+        self.bulk_model = bulk_model
+        self.long_transcript_model = long_transcript_model
+        self.long_transcript_chars = long_transcript_chars
+        self.hedge_percentile = hedge_percentile
+        self.min_samples = min_samples
+        self.default_hedge_delay = default_hedge_delay
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="model-router")
+        self._stats: dict[str, ModelStats] = {}
+        self._lock = threading.Lock()
+
+    def resize(self, max_workers: int) -> None:
+        """Replace the call pool with one of ``max_workers`` threads."""
+        old = self._pool
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="model-router")
+        # Calls already running on the old pool finish on their own threads
+        old.shutdown(wait=False)
+
+    def route(self, transcript_chars: int = 0, priority: str = "interactive") -> tuple[str, str | None]:
+        """Return ``(primary, fallback)`` models for a request."""
+        if transcript_chars > self.long_transcript_chars:
+            primary = self.long_transcript_model
+        elif priority == "bulk":
+            primary = self.bulk_model
+        else:
+            primary = self.default_model
+        fallback = self.fallback_model if primary != self.fallback_model else self.default_model
+        return primary, (fallback if fallback != primary else None)
+
+    def hedge_delay(self, model: str) -> float:
+        """Seconds to wait on ``model`` before sending a hedged duplicate."""
+        with self._lock:
+            stats = self._model_stats(model)
+            if len(stats.latencies) < self.min_samples:
+                return self.default_hedge_delay
+            return stats.percentile(self.hedge_percentile)
+
+    def complete(self, *, transcript_chars: int = 0, priority: str = "interactive", **kwargs) -> str:
+        """Run a chat completion and return the message content."""
+        primary, fallback = self.route(transcript_chars, priority)
+        try:
+            if priority == "bulk":
+                return self._call(primary, **kwargs)
+            return self._call_hedged(primary, **kwargs)
+        except Exception as e:
+            if not fallback:
+                raise
+            print(f"⚠️  {primary} failed ({e}); falling back to {fallback}")
+            with self._lock:
+                self._model_stats(fallback).fallbacks += 1
+            return self._call(fallback, **kwargs)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {model: s.snapshot() for model, s in self._stats.items()}
+
+    def total_cost(self) -> float:
+        """Return the estimated USD spent across all models so far."""
+        with self._lock:
+            return sum(s.cost for s in self._stats.values())
+
+    def _model_stats(self, model: str) -> ModelStats:
+        stats = self._stats.get(model)
+        if stats is None:
+            stats = self._stats[model] = ModelStats()
+        return stats
+
+    def _call(self, model: str, **kwargs) -> str:
+        start = time.monotonic()
+        try:
+            response = self.create(model=model, timeout=self.timeout, **kwargs)
+        except Exception:
+            with self._lock:
+                stats = self._model_stats(model)
+                stats.calls += 1
+                stats.failures += 1
+            raise
+        elapsed = time.monotonic() - start
+
+        usage = getattr(response, "usage", None)
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        input_price, output_price = MODEL_PRICES.get(model, (0.0, 0.0))
+        with self._lock:
+            stats = self._model_stats(model)
+            stats.calls += 1
+            stats.latencies.append(elapsed)
+            stats.prompt_tokens += prompt_tokens
+            stats.completion_tokens += completion_tokens
+            stats.cost += (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+        return response.choices[0].message.content
+
+    def _call_hedged(self, model: str, **kwargs) -> str:
+        first = self._pool.submit(self._call, model, **kwargs)
+        done, _ = wait([first], timeout=self.hedge_delay(model))
+        if done:
+            return first.result()
+
+        print(f"⏱️  {model} is slow; sending hedged request")
+        with self._lock:
+            self._model_stats(model).hedges += 1
+        second = self._pool.submit(self._call, model, **kwargs)
+
+        pending = {first, second}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is second:
+                        with self._lock:
+                            self._model_stats(model).hedge_wins += 1
+                    return future.result()
+                error = future.exception()
+        raise error
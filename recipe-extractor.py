@@ -1,14 +1,20 @@
 import os
 import sys
 import argparse
+import asyncio
+import hashlib
 import json
-from http.server import BaseHTTPRequestHandler, HTTPServer
+import math
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from urllib.parse import parse_qs, urlparse
 from dotenv import load_dotenv
 
 import openai
 import yt_dlp
 
+import video_transcripts
+from audio_pool import AudioPool
+from audio_cache import AudioCache
 from video_transcripts import (
     is_youtube_url,
     download_audio_with_ytdlp,
@@ -18,8 +24,28 @@ from video_transcripts import (
     get_caption_languages,
     transcribe_whisper,
     extract_video_transcript,
+    extract_video_transcript_parts,
     AUDIO_FILE,
 )
+from scheduling import FairScheduler, QueueFull, RateLimited, LANES, current_lane
+from model_routing import ModelRouter
+from http_caching import (
+    DEFAULT_CACHE_CONTROL,
+    MIN_COMPRESS_SIZE,
+    compress,
+    etag_matches,
+    make_etag,
+    negotiate_encoding,
+)
+from corpus import RecipeStore, rederive
+from recipes import (
+    Recipe,
+    RecipeCache,
+    render,
+    FORMATS,
+    CONTENT_TYPES,
+    FILE_EXTENSIONS,
+)
 
 load_dotenv()
 
@@ -28,13 +54,14 @@ if not OPENAI_API_KEY:
     print("Error: OPENAI_API_KEY not set")
     sys.exit(1)
 
+# Resolve openai at call time so a client configured later (or a test
+# double) is picked up.
+MODEL_ROUTER = ModelRouter(lambda **kwargs: openai.chat.completions.create(**kwargs))
 
 
-def extract_recipe_with_gpt(transcript, language="english"):
-    openai.api_key = OPENAI_API_KEY
-    
-    # Single English prompt with optional language instruction
-    prompt = f"""
+SYSTEM_MESSAGE = "You are a pedagogical chef and nutritionist."
+
+PROMPT_TEMPLATE = """
 You are extracting recipe information from a video transcription. Follow these rules STRICTLY:
 
 1. INGREDIENTS: Extract ONLY ingredients explicitly mentioned. Do NOT add common ingredients like salt, pepper, oil, rice, etc. unless specifically mentioned.
@@ -48,134 +75,192 @@ CRITICAL: If you add ANY ingredient, step, or tip not explicitly stated in the t
 Transcription:
 \"\"\"{transcript}\"\"\"
 """
-    
+
+LANGUAGE_INSTRUCTION = "\n\nIMPORTANT: Regardless of the language used in the transcription, please provide your response (ingredients, steps, tips, etc.) in {output_language}."
+
+# Define JSON schema for structured output
+RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "recipe_extraction",
+        "schema": {
+            "type": "object",
+            "properties": {
+                "title": {"type": "string"},
+                "ingredients": {
+                    "type": "array",
+                    "items": {"type": "string"}
+                },
+                "steps": {
+                    "type": "array",
+                    "items": {"type": "string"}
+                },
+                "tips": {
+                    "type": "array",
+                    "items": {"type": "string"}
+                },
+                "servings": {"type": "string"},
+                "healthiness": {
+                    "type": "object",
+                    "properties": {
+                        "indicator": {
+                            "type": "string",
+                            "enum": ["healthy", "neutral", "unhealthy"]
+                        },
+                        "rationale": {"type": "string"}
+                    },
+                    "required": ["indicator", "rationale"]
+                }
+            },
+            "required": ["title", "ingredients", "steps", "tips", "servings", "healthiness"]
+        }
+    }
+}
+
+# Changes whenever the prompt or schema changes; stored alongside each recipe
+# so --rederive can find recipes produced by an older version.
+EXTRACTION_VERSION = hashlib.sha256(
+    json.dumps(
+        [SYSTEM_MESSAGE, PROMPT_TEMPLATE, LANGUAGE_INSTRUCTION, RESPONSE_FORMAT],
+        sort_keys=True,
+    ).encode("utf-8")
+).hexdigest()[:12]
+
+
+def extract_recipe_with_gpt(transcript, language="english", priority=None):
+    """Extract a structured recipe from ``transcript`` and return it as JSON.
+
+    The model is chosen by :data:`MODEL_ROUTER` from the transcript size and
+    ``priority``, which defaults to the scheduler lane the call runs in.
+    """
+    openai.api_key = OPENAI_API_KEY
+
+    # Single English prompt with optional language instruction
+    prompt = PROMPT_TEMPLATE.format(transcript=transcript)
+
     # Always add explicit language instruction
     language_names = {
         "english": "English",
         "french": "French"
     }
     output_language = language_names.get(language, language.title())
-    prompt += f"\n\nIMPORTANT: Regardless of the language used in the transcription, please provide your response (ingredients, steps, tips, etc.) in {output_language}."
+    prompt += LANGUAGE_INSTRUCTION.format(output_language=output_language)
     print(f"🌍 Added explicit language instruction: output in {output_language}")
-    
-    system_message = "You are a pedagogical chef and nutritionist."
-    
-    # Define JSON schema for structured output
-    response_format = {
-        "type": "json_schema",
-        "json_schema": {
-            "name": "recipe_extraction",
-            "schema": {
-                "type": "object",
-                "properties": {
-                    "title": {"type": "string"},
-                    "ingredients": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    },
-                    "steps": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    },
-                    "tips": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    },
-                    "servings": {"type": "string"},
-                    "healthiness": {
-                        "type": "object",
-                        "properties": {
-                            "indicator": {
-                                "type": "string",
-                                "enum": ["healthy", "neutral", "unhealthy"]
-                            },
-                            "rationale": {"type": "string"}
-                        },
-                        "required": ["indicator", "rationale"]
-                    }
-                },
-                "required": ["title", "ingredients", "steps", "tips", "servings", "healthiness"]
-            }
-        }
-    }
-    response = openai.chat.completions.create(
-        # model="gpt-4o",
-        model="gpt-4o-mini",
+
+    return MODEL_ROUTER.complete(
+        transcript_chars=len(transcript),
+        priority=priority or current_lane() or "interactive",
         messages=[
-            {"role": "system", "content": system_message},
+            {"role": "system", "content": SYSTEM_MESSAGE},
             {"role": "user", "content": prompt}
         ],
         temperature=0.2,
-        response_format=response_format
+        response_format=RESPONSE_FORMAT
     )
-    return response.choices[0].message.content
 
 def convert_to_markdown(recipe_json, language="english"):
     """Convert recipe JSON to markdown format with localized section headings."""
-    recipe = json.loads(recipe_json)
-
-    headings = {
-        "english": {
-            "servings": "Servings",
-            "ingredients": "Ingredients",
-            "instructions": "Instructions",
-            "tips": "Tips & Tricks",
-            "health": "Health Assessment",
-        },
-        "french": {
-            "servings": "Portions",
-            "ingredients": "Ingr\u00e9dients",
-            "instructions": "Instructions",
-            "tips": "Astuces",
-            "health": "\u00c9valuation de la sant\u00e9",
-        },
-    }
+    if isinstance(recipe_json, str):
+        recipe_json = Recipe.from_json(recipe_json)
+    return render(recipe_json, "markdown", language)
 
-    labels = headings.get(language.lower(), headings["english"])
 
-    markdown = f"# {recipe['title']}\n\n"
+RECIPE_CACHE = RecipeCache()
 
-    markdown += f"**{labels['servings']}:** {recipe['servings']}\n\n"
 
-    markdown += f"## {labels['ingredients']}\n"
-    for ingredient in recipe['ingredients']:
-        markdown += f"- {ingredient}\n"
-    markdown += "\n"
+# Optional on-disk corpus of transcripts and recipes, enabled with --store
+RECIPE_STORE = None
 
-    markdown += f"## {labels['instructions']}\n"
-    for i, step in enumerate(recipe['steps'], 1):
-        markdown += f"{i}. {step}\n"
-    markdown += "\n"
 
-    if recipe['tips']:
-        markdown += f"## {labels['tips']}\n"
-        for tip in recipe['tips']:
-            markdown += f"- {tip}\n"
-        markdown += "\n"
+def extract_recipe_object(url, language="english", save_transcript=None):
+    """Extract a recipe from a URL and return it as a :class:`Recipe`.
 
-    markdown += f"## {labels['health']}\n"
-    markdown += f"{recipe['healthiness']['indicator']} {recipe['healthiness']['rationale']}\n"
+    When :data:`RECIPE_STORE` is set, a stored transcript is reused instead of
+    downloading the video, and the transcript and recipe are recorded so the
+    recipe can be re-derived later with ``--rederive``.
+    """
+    print(f"🎯 Extracting from URL: {url}")
 
-    return markdown
+    combined = RECIPE_STORE.load_transcript(url) if RECIPE_STORE else None
+    if combined is not None:
+        print("📦 Using stored transcript")
+        spoken = RECIPE_STORE.load_spoken_transcript(url)
+    else:
+        combined, spoken = extract_video_transcript_parts(url)
+        if RECIPE_STORE:
+            RECIPE_STORE.save_transcript(url, combined, spoken)
 
+    # Like extract_video_transcript, save only what Whisper transcribed
+    if save_transcript and spoken is not None:
+        with open(save_transcript, "w", encoding="utf-8") as f:
+            f.write(spoken)
 
-def extract_recipe(url, language="english", output_format="json", save_transcript=None):
-    """High-level helper to extract a recipe from a URL and return it as a string."""
-    print(f"🎯 Extracting from URL: {url}")
+    print(f"🤖 Extracting recipe using AI (language: {language})...")
+    recipe = Recipe.from_json(extract_recipe_with_gpt(combined, language))
+    if RECIPE_STORE:
+        RECIPE_STORE.save_recipe(url, language, recipe, EXTRACTION_VERSION)
+    return recipe
 
-    combined = extract_video_transcript(url, save_transcript=save_transcript)
 
-    print(f"🤖 Extracting recipe using AI (language: {language})...")
-    structured_recipe = extract_recipe_with_gpt(combined, language)
+def lookup_recipe(url, language="english", output_format="json"):
+    """Return an already extracted recipe rendered as ``output_format``.
 
-    if output_format == "markdown":
-        return convert_to_markdown(structured_recipe, language)
-    else:
-        # ensure valid JSON formatting
-        return json.dumps(json.loads(structured_recipe), ensure_ascii=False)
+    Checks :data:`RECIPE_CACHE` and then :data:`RECIPE_STORE`, loading a
+    stored recipe made with the current prompt and schema into the cache.
+    Returns ``None`` when the recipe would have to be extracted.
+    """
+    cached = RECIPE_CACHE.render(url, language, output_format)
+    if cached is None and RECIPE_STORE:
+        stored = RECIPE_STORE.load_recipe(url, language)
+        if stored and stored[1] == EXTRACTION_VERSION:
+            RECIPE_CACHE.put(url, language, stored[0])
+            cached = RECIPE_CACHE.render(url, language, output_format, count=False)
+    return cached
+
+
+def extract_recipe(url, language="english", output_format="json", save_transcript=None):
+    """High-level helper to extract a recipe from a URL and return it as a string.
 
+    Extracted recipes are kept in :data:`RECIPE_CACHE` so requesting another
+    format or repeating a request only renders the cached recipe.
+    """
+    if output_format not in FORMATS:
+        raise ValueError(f"Unsupported output format: {output_format}")
+
+    # Saving the transcript needs the pipeline to actually run
+    if not save_transcript:
+        cached = lookup_recipe(url, language, output_format)
+        if cached is not None:
+            print(f"♻️  Using cached recipe for {url}")
+            return cached
+
+    recipe = extract_recipe_object(url, language, save_transcript)
+    RECIPE_CACHE.put(url, language, recipe)
+    return RECIPE_CACHE.render(url, language, output_format, count=False)
+
+
+def server_stats(scheduler):
+    """Return scheduler, model, cache and audio pool statistics for the servers."""
+    stats = {
+        **scheduler.stats(),
+        "models": MODEL_ROUTER.stats(),
+        "recipe_cache": RECIPE_CACHE.stats(),
+    }
+    if video_transcripts.AUDIO_POOL is not None:
+        stats["audio_pool"] = video_transcripts.AUDIO_POOL.stats()
+    if video_transcripts.AUDIO_CACHE is not None:
+        stats["audio_cache"] = video_transcripts.AUDIO_CACHE.stats()
+    return stats
 
-def run_rest_server(host="0.0.0.0", port=8000, *, serve_forever=True):
+
+def run_rest_server(
+    host="0.0.0.0",
+    port=8000,
+    *,
+    serve_forever=True,
+    scheduler=None,
+    cache_control=DEFAULT_CACHE_CONTROL,
+):
     """Run a very small REST API server.
 
     Parameters
@@ -188,11 +273,74 @@ def run_rest_server(host="0.0.0.0", port=8000, *, serve_forever=True):
         If ``True`` (default) block and serve forever. When ``False`` the
         configured ``HTTPServer`` instance is returned without entering the
         serving loop. This is useful for unit tests.
+    scheduler : FairScheduler, optional
+        Scheduler used to rate-limit clients and run extractions fairly. A
+        default instance is created when omitted and exposed as
+        ``server.scheduler``.
+    cache_control : str, optional
+        ``Cache-Control`` header sent with successful ``/extract`` responses.
     """
 
+    if scheduler is None:
+        scheduler = FairScheduler()
+
     class Handler(BaseHTTPRequestHandler):
+        # Keep connections alive between requests; every response sets
+        # Content-Length so clients know where each body ends.
+        protocol_version = "HTTP/1.1"
+
+        def client_id(self):
+            return scheduler.identify(self.headers.get("X-API-Key"), self.client_address[0])
+
+        def send_json(self, status, payload, headers=None):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def send_rate_limited(self, error):
+            # Tell the client when its bucket will hold a token again
+            self.send_json(
+                429,
+                {"error": str(error)},
+                {"Retry-After": str(math.ceil(error.retry_after))},
+            )
+
+        def send_recipe(self, body, content_type):
+            """Send a cacheable recipe body, honouring validators and encodings."""
+            encoding = negotiate_encoding(self.headers.get("Accept-Encoding"))
+            if len(body) < MIN_COMPRESS_SIZE:
+                encoding = None
+            etag = make_etag(body, encoding)
+
+            not_modified = etag_matches(self.headers.get("If-None-Match"), etag)
+            if not_modified:
+                self.send_response(304)
+            else:
+                if encoding:
+                    body = compress(body, encoding)
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                if encoding:
+                    self.send_header("Content-Encoding", encoding)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", cache_control)
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            if not not_modified:
+                self.wfile.write(body)
+
         def do_GET(self):
             parsed = urlparse(self.path)
+            if parsed.path == "/stats":
+                self.send_json(200, server_stats(scheduler))
+                return
             if parsed.path != "/extract":
                 self.send_error(404, "Not Found")
                 return
@@ -205,35 +353,76 @@ def run_rest_server(host="0.0.0.0", port=8000, *, serve_forever=True):
 
             language = qs.get("language", ["english"])[0]
             fmt = qs.get("format", ["json"])[0]
+            if fmt not in FORMATS:
+                # Never echo request input into the status line
+                self.send_json(400, {"error": f"Invalid format: {fmt}"})
+                return
+            priority = qs.get("priority", ["interactive"])[0]
+            if priority not in LANES:
+                self.send_json(400, {"error": f"Invalid priority: {priority}"})
+                return
+
+            # Repeat hits skip the queue but still cost a rate-limit token
+            cached = lookup_recipe(url, language, fmt)
+            if cached is not None:
+                try:
+                    scheduler.admit(self.client_id(), priority)
+                except RateLimited as e:
+                    self.send_rate_limited(e)
+                    return
+                self.send_recipe(cached.encode("utf-8"), CONTENT_TYPES[fmt])
+                return
 
             try:
-                result = extract_recipe(url, language, fmt)
+                future = scheduler.submit(
+                    self.client_id(), priority, extract_recipe, url, language, fmt
+                )
+            except RateLimited as e:
+                self.send_rate_limited(e)
+                return
+            except QueueFull as e:
+                self.send_json(503, {"error": str(e)}, {"Retry-After": "1"})
+                return
+
+            try:
+                result = future.result()
+            except QueueFull as e:
+                self.send_json(503, {"error": str(e)}, {"Retry-After": "1"})
+                return
             except Exception as e:
                 self.send_error(500, str(e))
                 return
 
-            if fmt == "markdown":
-                self.send_response(200)
-                self.send_header("Content-Type", "text/markdown; charset=utf-8")
-            else:
-                self.send_response(200)
-                self.send_header("Content-Type", "application/json; charset=utf-8")
-            self.end_headers()
-            self.wfile.write(result.encode("utf-8"))
+            self.send_recipe(result.encode("utf-8"), CONTENT_TYPES[fmt])
 
-    server = HTTPServer((host, port), Handler)
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.scheduler = scheduler
     print(f"🚀 REST API running on http://{host}:{port}")
     if serve_forever:
         server.serve_forever()
     return server
 
 
+def _mcp_client_id(mcp) -> str:
+    """Identify the caller of an MCP tool by API key header or peer address."""
+    try:
+        request = mcp.get_context().request_context.request
+    except Exception:
+        request = None
+    if request is None:
+        # stdio and in-memory sessions have a single local client
+        return mcp.scheduler.identify(None, "local")
+    peer = request.client.host if request.client else "local"
+    return mcp.scheduler.identify(request.headers.get("x-api-key"), peer)
+
+
 def run_mcp_server(
     host: str = "0.0.0.0",
     port: int = 8000,
     transport: str = "stdio",
     *,
     serve_forever: bool = True,
+    scheduler: FairScheduler | None = None,
 ):
     """Run an MCP server using the official Python SDK.
 
@@ -248,15 +437,38 @@ def run_mcp_server(
     serve_forever : bool, optional
         When ``True`` (default) the server runs and blocks. When ``False`` the
         :class:`FastMCP` instance is returned for manual control and testing.
+    scheduler : FairScheduler, optional
+        Scheduler used to rate-limit clients and run extractions fairly. A
+        default instance is created when omitted and exposed as
+        ``mcp.scheduler``.
     """
 
     from mcp.server.fastmcp import FastMCP
 
+    if scheduler is None:
+        scheduler = FairScheduler()
+
     mcp = FastMCP("Recipe Extractor", host=host, port=port)
+    mcp.scheduler = scheduler
 
     @mcp.tool(name="extract_recipe")
-    def extract(url: str, language: str = "english", format: str = "json") -> str:
-        return extract_recipe(url, language, format)
+    async def extract(
+        url: str,
+        language: str = "english",
+        format: str = "json",
+        priority: str = "interactive",
+    ) -> str:
+        if priority not in LANES:
+            raise ValueError(f"Invalid priority: {priority}")
+        future = scheduler.submit(
+            _mcp_client_id(mcp), priority, extract_recipe, url, language, format
+        )
+        # Wait without blocking the event loop so other sessions keep flowing
+        return await asyncio.wrap_future(future)
+
+    @mcp.tool(name="scheduler_stats")
+    def stats() -> str:
+        return json.dumps(server_stats(scheduler))
 
     if serve_forever:
         mcp.run(transport)
@@ -279,7 +491,7 @@ Examples:
     parser.add_argument('--output', '-o', help='Output file name (without extension, will be added based on format)')
     parser.add_argument('--language', '-l', choices=['english', 'french'], default='english',
                        help='Language for recipe extraction (default: english)')
-    parser.add_argument('--format', '-f', choices=['json', 'markdown'], default='json',
+    parser.add_argument('--format', '-f', choices=FORMATS, default='json',
                        help='Output format (default: json)')
     parser.add_argument('--save-transcript', nargs='?', const='transcription.txt', metavar='FILE',
                        help='Save transcription to file (default: transcription.txt if no filename provided)')
@@ -289,14 +501,88 @@ Examples:
     parser.add_argument('--port', type=int, default=8000, help='Server port (default: 8000)')
     parser.add_argument('--mcp-transport', choices=['stdio', 'streamable-http'], default='stdio',
                         help='Transport for MCP server (default: stdio)')
+    parser.add_argument('--audio-workers', type=int, default=os.cpu_count(),
+                        help='Processes for audio download and conversion in server mode (default: CPU count)')
+    parser.add_argument('--audio-queue', type=int, default=16,
+                        help='Audio jobs allowed to wait for a free process (default: 16)')
+    parser.add_argument('--audio-cache', metavar='DIR',
+                        help='Keep downloaded audio in DIR so retries and retranscriptions skip the download')
+    parser.add_argument('--audio-cache-size', type=int, default=2048, metavar='MB',
+                        help='Disk budget for --audio-cache in megabytes (default: 2048)')
+    parser.add_argument('--cache-control', default=DEFAULT_CACHE_CONTROL,
+                        help=f'Cache-Control header for REST responses (default: "{DEFAULT_CACHE_CONTROL}")')
+    parser.add_argument('--store', metavar='DIR',
+                        help='Keep transcripts and recipes in DIR so recipes can be re-derived later')
+    parser.add_argument('--rederive', action='store_true',
+                        help='Re-run only the AI extraction for stored recipes with an outdated prompt or schema')
+    parser.add_argument('--concurrency', type=int, default=4,
+                        help='Parallel extractions for --rederive (default: 4)')
+    parser.add_argument('--budget', type=float, metavar='USD',
+                        help='Stop --rederive once this much has been spent on the model')
+    parser.add_argument('--limit', type=int, help='Re-derive at most this many recipes')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Concurrent extractions in server mode; use at least 2 so bulk '
+                             'requests cannot block interactive ones (default: 4)')
+    parser.add_argument('--rate-limit', type=float, default=30,
+                        help='Requests per minute allowed per client in server mode, 0 to disable (default: 30)')
+    parser.add_argument('--burst', type=int, default=10,
+                        help='Requests a client may send at once before being rate limited (default: 10)')
+    parser.add_argument('--api-keys-file', metavar='FILE',
+                        help='File with one known API key per line; other callers are rate limited by address')
+    parser.add_argument('--max-queue', type=int, default=100,
+                        help='Maximum queued requests per priority lane (default: 100)')
     
     args = parser.parse_args()
 
+    global RECIPE_STORE
+    if args.store:
+        RECIPE_STORE = RecipeStore(args.store)
+    if args.audio_cache:
+        video_transcripts.AUDIO_CACHE = AudioCache(
+            args.audio_cache, args.audio_cache_size * 1024 * 1024
+        )
+
+    if args.rederive:
+        if not RECIPE_STORE:
+            parser.error("--rederive requires --store")
+        report = rederive(
+            RECIPE_STORE,
+            lambda transcript, language: extract_recipe_with_gpt(
+                transcript, language, priority="bulk"
+            ),
+            EXTRACTION_VERSION,
+            concurrency=args.concurrency,
+            budget=args.budget,
+            spent=MODEL_ROUTER.total_cost,
+            limit=args.limit,
+        )
+        print(json.dumps(report, indent=2))
+        return
+
+    if args.server or args.mcp:
+        api_keys = []
+        if args.api_keys_file:
+            with open(args.api_keys_file, encoding="utf-8") as f:
+                api_keys = [line.strip() for line in f if line.strip()]
+        # Every extraction may run a primary and a hedged call at once
+        MODEL_ROUTER.resize(2 * args.workers)
+        video_transcripts.AUDIO_POOL = AudioPool(
+            args.audio_workers, max_queue=args.audio_queue
+        )
+        scheduler = FairScheduler(
+            args.workers,
+            rate=args.rate_limit / 60 if args.rate_limit > 0 else None,
+            burst=args.burst,
+            max_queue=args.max_queue,
+            api_keys=api_keys,
+        )
     if args.server:
-        run_rest_server(args.host, args.port)
+        run_rest_server(
+            args.host, args.port, scheduler=scheduler, cache_control=args.cache_control
+        )
         return
     if args.mcp:
-        run_mcp_server(args.host, args.port, args.mcp_transport)
+        run_mcp_server(args.host, args.port, args.mcp_transport, scheduler=scheduler)
         return
 
     if not args.url:
@@ -308,36 +594,22 @@ Examples:
     print(f"💾 Output: {args.output or 'structured_recipe'}")
     print()
     
-    combined = extract_video_transcript(
-        args.url, save_transcript=args.save_transcript
-    )
-    
-    print(f"🤖 Extracting recipe using AI (language: {args.language})...")
-    structured_recipe = extract_recipe_with_gpt(combined, args.language)
-    
+    recipe = extract_recipe_object(args.url, args.language, args.save_transcript)
+
     print("✅ AI extraction completed")
-    
+
     # Determine output filename
     if args.output:
         base_filename = args.output
     else:
         base_filename = "structured_recipe"
-    
-    # Save output based on format
-    if args.format == 'json':
-        filename = f"{base_filename}.json"
-        with open(filename, "w", encoding="utf-8") as f:
-            # Parse and reformat JSON to ensure proper formatting
-            recipe_dict = json.loads(structured_recipe)
-            json.dump(recipe_dict, f, indent=2, ensure_ascii=False)
-        print(f"✅ Structured recipe saved as {filename}")
-    else:  # markdown
-        filename = f"{base_filename}.md"
-        markdown_content = convert_to_markdown(structured_recipe, args.language)
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(markdown_content)
-        print(f"✅ Structured recipe saved as {filename}")
+
+    filename = f"{base_filename}.{FILE_EXTENSIONS[args.format]}"
+    options = {"indent": 2} if args.format in ("json", "jsonld") else {}
+    content = render(recipe, args.format, args.language, **options)
+    with open(filename, "w", encoding="utf-8") as f:
+        f.write(content)
+    print(f"✅ Structured recipe saved as {filename}")
 
 if __name__ == "__main__":
     main()
-
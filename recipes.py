@@ -0,0 +1,250 @@
+import html
+import io
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+
+HEADINGS = {
+    "english": {
+        "servings": "Servings",
+        "ingredients": "Ingredients",
+        "instructions": "Instructions",
+        "tips": "Tips & Tricks",
+        "health": "Health Assessment",
+    },
+    "french": {
+        "servings": "Portions",
+        "ingredients": "Ingrédients",
+        "instructions": "Instructions",
+        "tips": "Astuces",
+        "health": "Évaluation de la santé",
+    },
+}
+
+LANGUAGE_CODES = {"english": "en", "french": "fr"}
+
+
+@dataclass
+class Healthiness:
+    indicator: str = ""
+    rationale: str = ""
+
+
+@dataclass
+class Recipe:
+    """Structured recipe as returned by the ``recipe_extraction`` schema."""
+
+    title: str = ""
+    ingredients: list[str] = field(default_factory=list)
+    steps: list[str] = field(default_factory=list)
+    tips: list[str] = field(default_factory=list)
+    servings: str = ""
+    healthiness: Healthiness = field(default_factory=Healthiness)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Recipe":
+        health = data.get("healthiness") or {}
+        return cls(
+            title=data.get("title", ""),
+            ingredients=list(data.get("ingredients", [])),
+            steps=list(data.get("steps", [])),
+            tips=list(data.get("tips", [])),
+            servings=data.get("servings", ""),
+            healthiness=Healthiness(
+                indicator=health.get("indicator", ""),
+                rationale=health.get("rationale", ""),
+            ),
+        )
+
+    @classmethod
+    def from_json(cls, text: str) -> "Recipe":
+        """Parse the model's JSON response once into a :class:`Recipe`."""
+        return cls.from_dict(json.loads(text))
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _labels(language: str) -> dict:
+    return HEADINGS.get(language.lower(), HEADINGS["english"])
+
+
+def write_json(recipe: Recipe, buf, language: str = "english", *, indent=None) -> None:
+    json.dump(recipe.to_dict(), buf, ensure_ascii=False, indent=indent)
+
+
+def write_markdown(recipe: Recipe, buf, language: str = "english") -> None:
+    labels = _labels(language)
+    w = buf.write
+
+    w(f"# {recipe.title}\n\n")
+    w(f"**{labels['servings']}:** {recipe.servings}\n\n")
+
+    w(f"## {labels['ingredients']}\n")
+    for ingredient in recipe.ingredients:
+        w(f"- {ingredient}\n")
+    w("\n")
+
+    w(f"## {labels['instructions']}\n")
+    for i, step in enumerate(recipe.steps, 1):
+        w(f"{i}. {step}\n")
+    w("\n")
+
+    if recipe.tips:
+        w(f"## {labels['tips']}\n")
+        for tip in recipe.tips:
+            w(f"- {tip}\n")
+        w("\n")
+
+    w(f"## {labels['health']}\n")
+    w(f"{recipe.healthiness.indicator} {recipe.healthiness.rationale}\n")
+
+
+def write_html(recipe: Recipe, buf, language: str = "english") -> None:
+    labels = _labels(language)
+    esc = html.escape
+    w = buf.write
+
+    lang = LANGUAGE_CODES.get(language.lower(), "en")
+    w(f'<!DOCTYPE html>\n<html lang="{lang}">\n<head>\n<meta charset="utf-8">\n')
+    w(f"<title>{esc(recipe.title)}</title>\n</head>\n<body>\n<article>\n")
+    w(f"<h1>{esc(recipe.title)}</h1>\n")
+    w(f"<p><strong>{esc(labels['servings'])}:</strong> {esc(recipe.servings)}</p>\n")
+
+    w(f"<h2>{esc(labels['ingredients'])}</h2>\n<ul>\n")
+    for ingredient in recipe.ingredients:
+        w(f"<li>{esc(ingredient)}</li>\n")
+    w("</ul>\n")
+
+    w(f"<h2>{esc(labels['instructions'])}</h2>\n<ol>\n")
+    for step in recipe.steps:
+        w(f"<li>{esc(step)}</li>\n")
+    w("</ol>\n")
+
+    if recipe.tips:
+        w(f"<h2>{esc(labels['tips'])}</h2>\n<ul>\n")
+        for tip in recipe.tips:
+            w(f"<li>{esc(tip)}</li>\n")
+        w("</ul>\n")
+
+    w(f"<h2>{esc(labels['health'])}</h2>\n")
+    w(f"<p>{esc(recipe.healthiness.indicator)} {esc(recipe.healthiness.rationale)}</p>\n")
+    w("</article>\n</body>\n</html>\n")
+
+
+def write_jsonld(recipe: Recipe, buf, language: str = "english", *, indent=None) -> None:
+    """Write the recipe as a schema.org ``Recipe`` JSON-LD document."""
+    doc = {
+        "@context": "https://schema.org",
+        "@type": "Recipe",
+        "name": recipe.title,
+        "inLanguage": LANGUAGE_CODES.get(language.lower(), language),
+        "recipeIngredient": recipe.ingredients,
+        "recipeInstructions": [
+            {"@type": "HowToStep", "position": i, "text": step}
+            for i, step in enumerate(recipe.steps, 1)
+        ],
+    }
+    if recipe.servings:
+        doc["recipeYield"] = recipe.servings
+    json.dump(doc, buf, ensure_ascii=False, indent=indent)
+
+
+RENDERERS = {
+    "json": write_json,
+    "markdown": write_markdown,
+    "html": write_html,
+    "jsonld": write_jsonld,
+}
+
+FORMATS = tuple(RENDERERS)
+
+CONTENT_TYPES = {
+    "json": "application/json; charset=utf-8",
+    "markdown": "text/markdown; charset=utf-8",
+    "html": "text/html; charset=utf-8",
+    "jsonld": "application/ld+json; charset=utf-8",
+}
+
+FILE_EXTENSIONS = {
+    "json": "json",
+    "markdown": "md",
+    "html": "html",
+    "jsonld": "jsonld",
+}
+
+
+def render(recipe: Recipe, output_format: str = "json", language: str = "english", **options) -> str:
+    """Render ``recipe`` in ``output_format`` and return the text."""
+    try:
+        writer = RENDERERS[output_format]
+    except KeyError:
+        raise ValueError(f"Unsupported output format: {output_format}") from None
+    buf = io.StringIO()
+    writer(recipe, buf, language, **options)
+    return buf.getvalue()
+
+
+class RecipeCache:
+    """Thread-safe LRU cache of extracted recipes and their renderings.
+
+    Entries are keyed by ``(url, language)`` and hold the parsed
+    :class:`Recipe` plus every format rendered from it so far, so asking for
+    another format of a known recipe costs one render and no extraction.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def put(self, url: str, language: str, recipe: Recipe) -> None:
+        with self._lock:
+            self._entries[(url, language)] = {"recipe": recipe, "renders": {}}
+            self._entries.move_to_end((url, language))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def render(self, url: str, language: str, output_format: str, *, count: bool = True) -> str | None:
+        """Return the cached rendering, rendering it first if needed.
+
+        Returns ``None`` when the recipe itself is not cached. Lookups are
+        counted in :meth:`stats` unless ``count`` is false, as when rendering
+        a recipe that was only just put in the cache.
+        """
+        key = (url, language)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if count:
+                    self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            if count:
+                self.hits += 1
+            text = entry["renders"].get(output_format)
+            recipe = entry["recipe"]
+        if text is None:
+            text = render(recipe, output_format, language)
+            with self._lock:
+                entry["renders"][output_format] = text
+        return text
+
+    def stats(self) -> dict:
+        """Return hit and miss counters and the number of cached recipes."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
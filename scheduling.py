@@ -0,0 +1,322 @@
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+
+LANES = ("interactive", "bulk")
+
+_current = threading.local()
+
+
+def current_lane() -> str | None:
+    """Return the lane of the job running on this thread, if any."""
+    return getattr(_current, "lane", None)
+
+
+class RateLimited(Exception):
+    """Raised when a client has exhausted its token bucket."""
+
+    def __init__(self, client: str, retry_after: float):
+        super().__init__(f"Rate limit exceeded for client {client}")
+        self.client = client
+        self.retry_after = retry_after
+
+
+class QueueFull(Exception):
+    """Raised when a lane has reached its maximum queue depth."""
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` if available.
+
+        Returns ``0.0`` on success, otherwise the number of seconds until
+        enough tokens will have been refilled.
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return 0.0
+        return (tokens - self.tokens) / self.rate
+
+
+class _Job:
+    __slots__ = ("client", "lane", "fn", "args", "kwargs", "future", "enqueued")
+
+    def __init__(self, client, lane, fn, args, kwargs):
+        self.client = client
+        self.lane = lane
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.future = Future()
+        self.enqueued = time.monotonic()
+
+
+class _Lane:
+    """Per-lane queues, one FIFO per client served round-robin."""
+
+    def __init__(self, name: str, max_queue: int | None):
+        self.name = name
+        self.max_queue = max_queue
+        self.queues: dict[str, deque] = {}
+        self.ready: deque = deque()  # clients with pending work, in service order
+        self.depth = 0
+        self.running = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.served_from_cache = 0
+        self.waits: deque = deque(maxlen=1000)
+
+    def push(self, job: _Job) -> None:
+        queue = self.queues.get(job.client)
+        if queue is None:
+            queue = self.queues[job.client] = deque()
+        if not queue:
+            self.ready.append(job.client)
+        queue.append(job)
+        self.depth += 1
+        self.submitted += 1
+
+    def pop(self) -> _Job:
+        client = self.ready.popleft()
+        queue = self.queues[client]
+        job = queue.popleft()
+        if queue:
+            # Client still has work: send it to the back of the line
+            self.ready.append(client)
+        else:
+            del self.queues[client]
+        self.depth -= 1
+        return job
+
+    def stats(self) -> dict:
+        waits = sorted(self.waits)
+        if waits:
+            avg = sum(waits) / len(waits)
+            p95 = waits[min(len(waits) - 1, int(len(waits) * 0.95))]
+        else:
+            avg = p95 = 0.0
+        return {
+            "queue_depth": self.depth,
+            "running": self.running,
+            "clients_waiting": len(self.ready),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "served_from_cache": self.served_from_cache,
+            "wait_avg_seconds": round(avg, 4),
+            "wait_p95_seconds": round(p95, 4),
+        }
+
+
+class FairScheduler:
+    """Rate-limited, fair scheduler shared by the REST and MCP servers.
+
+    Each client gets its own token bucket. Admitted jobs are queued in one of
+    two lanes: ``interactive`` work is always dispatched before ``bulk`` work,
+    and with at least two workers bulk jobs may never occupy every worker, so
+    an interactive request arriving during a backfill does not wait behind
+    it. A single worker is shared by both lanes and offers no such guarantee.
+    Within a lane clients are served round-robin, so one client submitting
+    hundreds of URLs only gets one turn per cycle.
+
+    Parameters
+    ----------
+    workers : int
+        Number of pipeline jobs allowed to run concurrently.
+    rate : float or None
+        Sustained requests per second allowed per client. ``None`` disables
+        rate limiting.
+    burst : int
+        Token bucket capacity, i.e. how many requests a client may send at
+        once before being throttled.
+    max_queue : int or None
+        Maximum number of queued jobs per lane. ``None`` means unbounded.
+    api_keys : iterable of str, optional
+        Known API keys. Only these are trusted as client identities; any
+        other caller is identified by its peer address.
+    max_clients : int
+        Maximum number of token buckets kept. Buckets idle long enough to be
+        full again are dropped first, then the least recently used.
+    bulk_workers : int or None
+        Maximum number of workers bulk jobs may occupy. Defaults to
+        ``workers - 1``; with one worker bulk jobs can use it too.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        *,
+        rate: float | None = None,
+        burst: int = 10,
+        max_queue: int | None = 100,
+        api_keys=None,
+        max_clients: int = 10000,
+        bulk_workers: int | None = None,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+        self.rate = rate
+        self.burst = burst
+        self.bulk_workers = bulk_workers if bulk_workers is not None else max(1, workers - 1)
+        self.api_keys = frozenset(api_keys or ())
+        self.max_clients = max_clients
+        self._buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+        self._lanes = {name: _Lane(name, max_queue) for name in LANES}
+        self._cond = threading.Condition()
+        self._closed = False
+        self._threads = [
+            threading.Thread(target=self._worker, name=f"scheduler-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def identify(self, api_key: str | None, peer: str) -> str:
+        """Return the client identity for a request.
+
+        Unknown API keys are ignored so callers cannot mint fresh rate-limit
+        buckets by sending arbitrary keys.
+        """
+        if api_key and api_key in self.api_keys:
+            return f"key:{api_key}"
+        return f"addr:{peer}"
+
+    def _bucket(self, client: str) -> TokenBucket:
+        now = time.monotonic()
+        # A bucket idle for burst/rate seconds is full again, so forgetting it
+        # does not change the client's allowance.
+        idle = self.burst / self.rate
+        bucket = self._buckets.pop(client, None)
+        while self._buckets:
+            oldest = next(iter(self._buckets.values()))
+            # The requesting client was popped above, so it is never evicted
+            # here, and capacity only matters when a new bucket is needed.
+            at_capacity = bucket is None and len(self._buckets) >= self.max_clients
+            if now - oldest.updated < idle and not at_capacity:
+                break
+            self._buckets.popitem(last=False)
+        if bucket is None:
+            bucket = TokenBucket(self.rate, self.burst)
+        self._buckets[client] = bucket
+        return bucket
+
+    def _take_token(self, client: str, q: "_Lane") -> None:
+        if self.rate is None:
+            return
+        retry_after = self._bucket(client).try_acquire()
+        if retry_after:
+            q.rejected += 1
+            raise RateLimited(client, retry_after)
+
+    def admit(self, client: str, lane: str) -> None:
+        """Charge ``client`` for a request answered without queueing.
+
+        Used for cache hits so they stay rate limited and are counted in
+        :meth:`stats`. Raises :class:`RateLimited` like :meth:`submit`.
+        """
+        if lane not in self._lanes:
+            raise ValueError(f"Unknown lane: {lane}")
+        with self._cond:
+            q = self._lanes[lane]
+            self._take_token(client, q)
+            q.served_from_cache += 1
+
+    def submit(self, client: str, lane: str, fn, *args, **kwargs) -> Future:
+        """Queue ``fn(*args, **kwargs)`` on behalf of ``client``.
+
+        Raises :class:`RateLimited` when the client is over its rate limit and
+        :class:`QueueFull` when the lane cannot accept more work.
+        """
+        if lane not in self._lanes:
+            raise ValueError(f"Unknown lane: {lane}")
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Scheduler is shut down")
+            q = self._lanes[lane]
+            # Check capacity first so a request turned away with QueueFull
+            # does not also cost the client a token
+            if q.max_queue is not None and q.depth >= q.max_queue:
+                q.rejected += 1
+                raise QueueFull(f"The {lane} queue is full")
+            self._take_token(client, q)
+            job = _Job(client, lane, fn, args, kwargs)
+            q.push(job)
+            self._cond.notify()
+        return job.future
+
+    def stats(self) -> dict:
+        """Return queue depth, wait times and throughput counters per lane."""
+        with self._cond:
+            return {
+                "workers": self.workers,
+                "bulk_workers": self.bulk_workers,
+                "tracked_clients": len(self._buckets),
+                "lanes": {name: lane.stats() for name, lane in self._lanes.items()},
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting work and let the workers drain the queues."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if wait:
+            for t in self._threads:
+                t.join()
+
+    def _next_job(self) -> _Job | None:
+        interactive = self._lanes["interactive"]
+        if interactive.depth:
+            return interactive.pop()
+        bulk = self._lanes["bulk"]
+        if bulk.depth and bulk.running < self.bulk_workers:
+            return bulk.pop()
+        return None
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None:
+                    if self._closed and not any(q.depth for q in self._lanes.values()):
+                        return
+                    self._cond.wait()
+                    job = self._next_job()
+                lane = self._lanes[job.lane]
+                lane.running += 1
+                lane.waits.append(time.monotonic() - job.enqueued)
+
+            ok = False
+            if job.future.set_running_or_notify_cancel():
+                _current.lane = job.lane
+                try:
+                    job.future.set_result(job.fn(*job.args, **job.kwargs))
+                    ok = True
+                except BaseException as e:
+                    job.future.set_exception(e)
+                finally:
+                    _current.lane = None
+
+            with self._cond:
+                lane.running -= 1
+                if ok:
+                    lane.completed += 1
+                else:
+                    lane.failed += 1
+                # A finished job may unblock bulk work held back by the cap
+                self._cond.notify_all()
@@ -0,0 +1,93 @@
+import os
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from audio_cache import AudioCache
+
+
+def write(path, size):
+    path.write_bytes(b"x" * size)
+    return path
+
+
+def test_fetch_returns_private_copy_and_counts_savings(tmp_path):
+    cache = AudioCache(tmp_path / "cache", max_bytes=1000)
+    src = write(tmp_path / "a.mp3", 100)
+    dest = tmp_path / "out.mp3"
+
+    assert not cache.fetch("Youtube-abc", "mp3", dest)
+    assert cache.put("Youtube-abc", "mp3", src)
+    os.remove(src)
+
+    assert cache.fetch("Youtube-abc", "mp3", dest)
+    assert dest.read_bytes() == b"x" * 100
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["bytes_saved"] == 100
+    assert stats["stored_bytes"] == 100
+
+
+def test_stats_skip_entries_removed_during_the_scan(tmp_path, monkeypatch):
+    cache = AudioCache(tmp_path / "cache", max_bytes=1000)
+    cache.put("a", "mp3", write(tmp_path / "a.mp3", 100))
+    cache.put("b", "mp3", write(tmp_path / "b.mp3", 200))
+
+    entries = list(cache._entries())
+    os.remove(cache.path_for("a", "mp3"))
+    monkeypatch.setattr(cache, "_entries", lambda: iter(entries))
+
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["stored_bytes"] == 200
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = AudioCache(tmp_path / "cache", max_bytes=250)
+    for i, name in enumerate(["a", "b"]):
+        cache.put(name, "mp3", write(tmp_path / f"{name}.mp3", 100))
+        os.utime(cache.path_for(name, "mp3"), (i, i))
+    # Touch "a" so "b" becomes the least recently used entry
+    cache.fetch("a", "mp3", tmp_path / "out.mp3")
+
+    cache.put("c", "mp3", write(tmp_path / "c.mp3", 100))
+
+    assert cache.path_for("a", "mp3").exists()
+    assert not cache.path_for("b", "mp3").exists()
+    assert cache.path_for("c", "mp3").exists()
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["stored_bytes"] <= 250
+
+
+def test_files_over_budget_are_not_cached(tmp_path):
+    cache = AudioCache(tmp_path / "cache", max_bytes=10)
+    assert not cache.put("big", "mp3", write(tmp_path / "big.mp3", 11))
+    assert cache.stats()["entries"] == 0
+
+
+def test_concurrent_puts_and_fetches_stay_within_budget(tmp_path):
+    cache = AudioCache(tmp_path / "cache", max_bytes=500)
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(20):
+                key = f"v{(n + i) % 8}"
+                dest = tmp_path / f"out-{n}-{i}.mp3"
+                if not cache.fetch(key, "mp3", dest):
+                    cache.put(key, "mp3", write(tmp_path / f"src-{n}-{i}.mp3", 100))
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert cache.stats()["stored_bytes"] <= 500
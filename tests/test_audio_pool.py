@@ -0,0 +1,42 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from audio_pool import AudioPool
+from scheduling import QueueFull
+
+
+def test_runs_in_worker_process_and_reports_stats():
+    pool = AudioPool(1)
+    try:
+        assert pool.run(pow, 2, 10) == 1024
+        with pytest.raises(ZeroDivisionError):
+            pool.run(divmod, 1, 0)
+        stats = pool.stats()
+    finally:
+        pool.shutdown()
+    assert stats["workers"] == 1
+    assert stats["completed"] == 1
+    assert stats["failed"] == 1
+    assert stats["in_flight"] == 0
+    assert stats["utilization"] >= 0
+
+
+def test_rejects_when_queue_is_full():
+    pool = AudioPool(1, max_queue=0)
+    thread = threading.Thread(target=pool.run, args=(time.sleep, 0.5))
+    thread.start()
+    try:
+        while pool.stats()["in_flight"] == 0:
+            time.sleep(0.01)
+        with pytest.raises(QueueFull):
+            pool.run(pow, 2, 2)
+        assert pool.stats()["rejected"] == 1
+    finally:
+        thread.join()
+        pool.shutdown()
@@ -0,0 +1,99 @@
+import json
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from corpus import RecipeStore, rederive
+from recipes import Recipe
+
+
+def fake_extract(transcript, language):
+    return json.dumps({"title": f"{transcript} ({language})"})
+
+
+def make_store(tmp_path):
+    store = RecipeStore(tmp_path / "corpus")
+    for i, version in enumerate(["v1", "v2", "v1"]):
+        url = f"http://v/{i}"
+        store.save_transcript(url, f"transcript {i}")
+        store.save_recipe(url, "english", Recipe(title="old"), version)
+    # Transcript without any recipe yet
+    store.save_transcript("http://v/new", "transcript new")
+    return store
+
+
+def test_store_round_trip(tmp_path):
+    store = make_store(tmp_path)
+    assert store.load_transcript("http://v/0") == "transcript 0"
+    assert store.load_transcript("http://missing") is None
+    recipe, version = store.load_recipe("http://v/1", "english")
+    assert recipe.title == "old"
+    assert version == "v2"
+
+
+def test_stale_lists_outdated_recipes(tmp_path):
+    store = make_store(tmp_path)
+    assert sorted(store.stale("v2")) == [("http://v/0", "english"), ("http://v/2", "english")]
+    assert ("http://v/new", "french") in set(store.stale("v2", ["french"]))
+
+
+def test_rederive_updates_only_stale_recipes(tmp_path):
+    store = make_store(tmp_path)
+    seen = []
+    lock = threading.Lock()
+
+    def extract(transcript, language):
+        with lock:
+            seen.append(transcript)
+        return fake_extract(transcript, language)
+
+    report = rederive(store, extract, "v2", concurrency=2)
+
+    assert sorted(seen) == ["transcript 0", "transcript 2"]
+    assert report["stale"] == 2
+    assert report["updated"] == 2
+    assert report["failed"] == 0
+    recipe, version = store.load_recipe("http://v/0", "english")
+    assert recipe.title == "transcript 0 (english)"
+    assert version == "v2"
+    assert list(store.stale("v2")) == []
+
+
+def test_rederive_stops_at_budget_and_records_failures(tmp_path):
+    store = make_store(tmp_path)
+    spent = {"usd": 0.0}
+
+    def extract(transcript, language):
+        spent["usd"] += 1.0
+        raise RuntimeError("model down")
+
+    report = rederive(
+        store, extract, "v3", concurrency=1, budget=1.0, spent=lambda: spent["usd"]
+    )
+    assert report["failed"] == 1
+    assert report["skipped"] == 2
+    assert report["spent"] == 1.0
+
+
+def test_concurrent_writes_to_same_url(tmp_path):
+    store = RecipeStore(tmp_path)
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(50):
+                store.save_transcript("http://v", f"transcript {n}-{i}")
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert store.load_transcript("http://v").startswith("transcript ")
+    assert not [p for p in tmp_path.rglob("*.tmp")]
@@ -0,0 +1,42 @@
+import gzip
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import http_caching
+from http_caching import compress, etag_matches, make_etag, negotiate_encoding
+
+
+def test_etag_is_deterministic_and_per_encoding():
+    assert make_etag(b"abc") == make_etag(b"abc")
+    assert make_etag(b"abc") != make_etag(b"abd")
+    assert make_etag(b"abc", "gzip").endswith('-gzip"')
+
+
+def test_etag_matches_ignores_weakness_and_coding():
+    etag = make_etag(b"abc")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{make_etag(b"abc", "gzip")}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_negotiate_encoding(monkeypatch):
+    monkeypatch.setattr(http_caching, "brotli", None)
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("br") is None
+    assert negotiate_encoding("gzip;q=0") is None
+    assert negotiate_encoding("*") == "gzip"
+
+    monkeypatch.setattr(http_caching, "brotli", object())
+    assert negotiate_encoding("gzip, br") == "br"
+    assert negotiate_encoding("gzip, br;q=0.5") == "gzip"
+
+
+def test_gzip_compression_is_deterministic():
+    body = b"recipe " * 100
+    assert compress(body, "gzip") == gzip.compress(body, mtime=0)
+    assert gzip.decompress(compress(body, "gzip")) == body
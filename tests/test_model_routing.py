@@ -0,0 +1,110 @@
+import sys
+import threading
+import time
+import types
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from model_routing import ModelRouter
+
+
+def make_response(content, prompt_tokens=1000, completion_tokens=100):
+    msg = types.SimpleNamespace(content=content)
+    usage = types.SimpleNamespace(
+        prompt_tokens=prompt_tokens, completion_tokens=completion_tokens
+    )
+    return types.SimpleNamespace(choices=[types.SimpleNamespace(message=msg)], usage=usage)
+
+
+class FakeEndpoint:
+    """Stands in for the chat completions endpoint with scripted behaviour."""
+
+    def __init__(self, script):
+        self.script = script  # list of (delay, error_or_none) consumed per call
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, *, model, timeout, **kwargs):
+        with self.lock:
+            self.calls.append((model, kwargs))
+            delay, error = self.script.pop(0) if self.script else (0, None)
+        time.sleep(delay)
+        if error:
+            raise error
+        return make_response(f"{model}:{len(self.calls)}")
+
+
+def test_route_by_size_and_priority():
+    router = ModelRouter(FakeEndpoint([]), long_transcript_chars=100)
+    assert router.route(10, "interactive") == ("gpt-4o-mini", "gpt-4o")
+    assert router.route(10, "bulk") == ("gpt-4o-mini", "gpt-4o")
+    assert router.route(1000, "interactive") == ("gpt-4o", "gpt-4o-mini")
+
+
+def test_records_latency_tokens_and_cost():
+    endpoint = FakeEndpoint([])
+    router = ModelRouter(endpoint)
+    assert router.complete(messages=[], temperature=0.2) == "gpt-4o-mini:1"
+    assert endpoint.calls[0][1] == {"messages": [], "temperature": 0.2}
+    stats = router.stats()["gpt-4o-mini"]
+    assert stats["calls"] == 1
+    assert stats["prompt_tokens"] == 1000
+    assert stats["cost_usd"] == pytest.approx((1000 * 0.15 + 100 * 0.60) / 1e6)
+    assert stats["latency_p95_seconds"] is not None
+
+
+def test_slow_primary_is_hedged():
+    endpoint = FakeEndpoint([(0.5, None), (0, None)])
+    router = ModelRouter(endpoint, default_hedge_delay=0.05)
+    assert router.complete(messages=[]) == "gpt-4o-mini:2"
+    stats = router.stats()["gpt-4o-mini"]
+    assert stats["hedges"] == 1
+    assert stats["hedge_wins"] == 1
+
+
+def test_hedge_delay_follows_observed_percentile():
+    router = ModelRouter(FakeEndpoint([]), min_samples=3, default_hedge_delay=9)
+    assert router.hedge_delay("gpt-4o-mini") == 9
+    for _ in range(3):
+        router.complete(messages=[], priority="bulk")
+    assert router.hedge_delay("gpt-4o-mini") < 1
+
+
+def test_bulk_is_not_hedged():
+    endpoint = FakeEndpoint([(0.2, None)])
+    router = ModelRouter(endpoint, default_hedge_delay=0.01)
+    router.complete(messages=[], priority="bulk")
+    assert len(endpoint.calls) == 1
+
+
+def test_errors_fall_back_to_alternate_model():
+    endpoint = FakeEndpoint([(0, RuntimeError("boom"))])
+    router = ModelRouter(endpoint)
+    assert router.complete(messages=[]) == "gpt-4o:2"
+    assert [model for model, _ in endpoint.calls] == ["gpt-4o-mini", "gpt-4o"]
+    stats = router.stats()
+    assert stats["gpt-4o-mini"]["failures"] == 1
+    assert stats["gpt-4o"]["fallbacks"] == 1
+
+
+def test_resize_replaces_call_pool():
+    router = ModelRouter(FakeEndpoint([(0.2, None)] * 4), max_workers=1, default_hedge_delay=5)
+    router.resize(4)
+    assert router._pool._max_workers == 4
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(router.complete(messages=[])))
+        for _ in range(4)
+    ]
+    start = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # With four threads the calls run side by side instead of queueing
+    assert time.monotonic() - start < 0.6
+    assert len(results) == 4
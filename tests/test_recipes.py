@@ -0,0 +1,68 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from recipes import Recipe, RecipeCache, render
+
+SAMPLE = {
+    "title": "Fish & Chips",
+    "ingredients": ["200 g cod", "2 potatoes"],
+    "steps": ["Fry the <cod>", "Fry the chips"],
+    "tips": [],
+    "servings": "2",
+    "healthiness": {"indicator": "unhealthy", "rationale": "Deep fried"},
+}
+
+
+def test_recipe_round_trips_model_json():
+    recipe = Recipe.from_json(json.dumps(SAMPLE))
+    assert recipe.healthiness.indicator == "unhealthy"
+    assert json.loads(render(recipe, "json")) == SAMPLE
+
+
+def test_recipe_tolerates_missing_fields():
+    recipe = Recipe.from_json("{}")
+    assert recipe.ingredients == []
+    assert "# " in render(recipe, "markdown")
+
+
+def test_render_html_escapes_content():
+    out = render(Recipe.from_dict(SAMPLE), "html", "french")
+    assert '<html lang="fr">' in out
+    assert "<h1>Fish &amp; Chips</h1>" in out
+    assert "<li>Fry the &lt;cod&gt;</li>" in out
+    assert "Ingrédients" in out
+
+
+def test_render_jsonld_is_schema_org_recipe():
+    doc = json.loads(render(Recipe.from_dict(SAMPLE), "jsonld"))
+    assert doc["@type"] == "Recipe"
+    assert doc["recipeIngredient"] == SAMPLE["ingredients"]
+    assert doc["recipeInstructions"][1] == {
+        "@type": "HowToStep",
+        "position": 2,
+        "text": "Fry the chips",
+    }
+    assert doc["recipeYield"] == "2"
+
+
+def test_cache_renders_each_format_once():
+    cache = RecipeCache(max_entries=1)
+    assert cache.render("u", "english", "json") is None
+
+    cache.put("u", "english", Recipe.from_dict(SAMPLE))
+    md = cache.render("u", "english", "markdown")
+    assert md.startswith("# Fish & Chips")
+    assert cache.render("u", "english", "markdown") is md
+
+    # Oldest entry is evicted past max_entries
+    cache.put("v", "english", Recipe.from_dict(SAMPLE))
+    assert cache.render("u", "english", "json") is None
+    assert cache.render("v", "english", "json", count=False) is not None
+
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
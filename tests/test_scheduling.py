@@ -0,0 +1,162 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from scheduling import FairScheduler, QueueFull, RateLimited, TokenBucket, current_lane
+
+
+def test_token_bucket_refuses_when_empty():
+    bucket = TokenBucket(rate=1.0, capacity=2)
+    assert bucket.try_acquire() == 0.0
+    assert bucket.try_acquire() == 0.0
+    retry_after = bucket.try_acquire()
+    assert 0 < retry_after <= 1.0
+
+
+def test_rate_limit_is_per_client():
+    scheduler = FairScheduler(1, rate=0.001, burst=1)
+    try:
+        assert scheduler.submit("a", "interactive", lambda: 1).result() == 1
+        with pytest.raises(RateLimited) as exc:
+            scheduler.submit("a", "interactive", lambda: 1)
+        assert exc.value.retry_after > 0
+        assert scheduler.submit("b", "interactive", lambda: 2).result() == 2
+    finally:
+        scheduler.shutdown()
+
+
+def test_unknown_api_keys_fall_back_to_peer_address():
+    scheduler = FairScheduler(1, rate=0.001, burst=1, api_keys={"known"})
+    try:
+        assert scheduler.identify("known", "10.0.0.1") == "key:known"
+        assert scheduler.identify("forged", "10.0.0.1") == "addr:10.0.0.1"
+        assert scheduler.identify(None, "10.0.0.1") == "addr:10.0.0.1"
+
+        accepted = 0
+        for i in range(50):
+            client = scheduler.identify(f"forged-{i}", "10.0.0.1")
+            try:
+                scheduler.submit(client, "interactive", lambda: None).result()
+                accepted += 1
+            except RateLimited:
+                pass
+        assert accepted == 1
+        assert scheduler.stats()["tracked_clients"] == 1
+    finally:
+        scheduler.shutdown()
+
+
+def test_idle_and_excess_buckets_are_evicted():
+    scheduler = FairScheduler(1, rate=1000.0, burst=1, max_clients=3)
+    try:
+        for i in range(10):
+            scheduler.submit(f"c{i}", "interactive", lambda: None).result()
+        # Buckets refill in 1ms, so idle ones are dropped as new clients arrive
+        assert scheduler.stats()["tracked_clients"] <= 3
+    finally:
+        scheduler.shutdown()
+
+    scheduler = FairScheduler(1, rate=0.001, burst=1, max_clients=3)
+    try:
+        for i in range(10):
+            scheduler.submit(f"c{i}", "interactive", lambda: None).result()
+        assert scheduler.stats()["tracked_clients"] == 3
+    finally:
+        scheduler.shutdown()
+
+
+def test_existing_clients_stay_throttled_at_capacity():
+    scheduler = FairScheduler(1, rate=0.001, burst=1, max_clients=2)
+    try:
+        accepted = 0
+        for i in range(12):
+            try:
+                scheduler.submit("ab"[i % 2], "interactive", lambda: None).result()
+                accepted += 1
+            except RateLimited:
+                pass
+        assert accepted == 2
+        assert scheduler.stats()["tracked_clients"] == 2
+    finally:
+        scheduler.shutdown()
+
+
+def test_clients_served_round_robin_with_interactive_first():
+    gate = threading.Event()
+    order = []
+    scheduler = FairScheduler(1, max_queue=None)
+    try:
+        # Occupy the only worker so everything else queues up
+        blocker = scheduler.submit("x", "interactive", gate.wait)
+        futures = [
+            scheduler.submit("bulk-client", "bulk", order.append, "bulk")
+        ]
+        futures += [
+            scheduler.submit("greedy", "interactive", order.append, f"greedy-{i}")
+            for i in range(3)
+        ]
+        futures.append(scheduler.submit("polite", "interactive", order.append, "polite"))
+        gate.set()
+        blocker.result()
+        for f in futures:
+            f.result()
+    finally:
+        scheduler.shutdown()
+
+    assert order == ["greedy-0", "polite", "greedy-1", "greedy-2", "bulk"]
+    lanes = scheduler.stats()["lanes"]
+    assert lanes["interactive"]["completed"] == 5
+    assert lanes["bulk"]["completed"] == 1
+    assert lanes["bulk"]["queue_depth"] == 0
+
+
+def test_queue_full_rejects():
+    gate = threading.Event()
+    scheduler = FairScheduler(1, max_queue=1)
+    try:
+        scheduler.submit("a", "interactive", gate.wait)
+        # Wait for the worker to pick the blocker up so the queue is empty
+        while scheduler.stats()["lanes"]["interactive"]["running"] == 0:
+            time.sleep(0.01)
+        scheduler.submit("a", "interactive", lambda: None)
+        with pytest.raises(QueueFull):
+            scheduler.submit("b", "interactive", lambda: None)
+    finally:
+        gate.set()
+        scheduler.shutdown()
+
+
+def test_current_lane_is_visible_to_jobs():
+    scheduler = FairScheduler(1)
+    try:
+        assert scheduler.submit("a", "bulk", current_lane).result() == "bulk"
+        assert scheduler.submit("a", "interactive", current_lane).result() == "interactive"
+    finally:
+        scheduler.shutdown()
+    assert current_lane() is None
+
+
+def test_queue_full_does_not_spend_a_token():
+    gate = threading.Event()
+    scheduler = FairScheduler(1, rate=0.001, burst=2, max_queue=1)
+    try:
+        # Another client occupies the only worker and the only queue slot
+        scheduler.submit("other", "interactive", gate.wait)
+        while scheduler.stats()["lanes"]["interactive"]["running"] == 0:
+            time.sleep(0.01)
+        filler = scheduler.submit("other", "interactive", lambda: None)
+        with pytest.raises(QueueFull):
+            scheduler.submit("a", "interactive", lambda: None)
+        gate.set()
+        filler.result()
+        # Both of the client's tokens are still available
+        scheduler.submit("a", "interactive", lambda: None).result()
+        scheduler.submit("a", "interactive", lambda: None).result()
+    finally:
+        gate.set()
+        scheduler.shutdown()
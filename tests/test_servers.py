@@ -1,8 +1,10 @@
 import importlib.util
+import inspect
 import os
 import sys
 import types
 import anyio
+import gzip
 import json
 import threading
 import http.client
@@ -45,6 +47,8 @@ if "mcp" not in sys.modules:
         class Client:
             async def call_tool(self, tool_name, data):
                 result_text = server.tools[tool_name](**data)
+                if inspect.isawaitable(result_text):
+                    result_text = await result_text
                 return types.SimpleNamespace(content=[types.SimpleNamespace(text=result_text)])
 
         class Session:
@@ -85,7 +89,10 @@ def test_rest_server_basic():
 
     recipe_extractor.extract_recipe = fake_extract
 
-    server = recipe_extractor.run_rest_server("127.0.0.1", 0, serve_forever=False)
+    scheduler = recipe_extractor.FairScheduler(1)
+    server = recipe_extractor.run_rest_server(
+        "127.0.0.1", 0, serve_forever=False, scheduler=scheduler
+    )
     port = server.server_address[1]
     thread = threading.Thread(target=server.serve_forever)
     thread.start()
@@ -100,6 +107,7 @@ def test_rest_server_basic():
     finally:
         server.shutdown()
         thread.join()
+        server.scheduler.shutdown()
 
 
 def test_mcp_server_basic():
@@ -131,3 +139,242 @@ def test_mcp_server_basic():
     anyio.run(run)
     assert results == [("http://v", "english", "json")]
 
+
+
+def test_rest_server_rate_limit_and_stats():
+    def fake_extract(url, language, fmt):
+        return "{}"
+
+    recipe_extractor.extract_recipe = fake_extract
+
+    scheduler = recipe_extractor.FairScheduler(
+        1, rate=0.001, burst=1, api_keys={"a", "b"}
+    )
+    server = recipe_extractor.run_rest_server(
+        "127.0.0.1", 0, serve_forever=False, scheduler=scheduler
+    )
+    port = server.server_address[1]
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        conn.request("GET", "/extract?url=http://v", headers={"X-API-Key": "a"})
+        resp = conn.getresponse()
+        resp.read()
+        assert resp.status == 200
+
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        conn.request("GET", "/extract?url=http://v", headers={"X-API-Key": "a"})
+        resp = conn.getresponse()
+        resp.read()
+        assert resp.status == 429
+        assert int(resp.getheader("Retry-After")) > 0
+
+        # An unknown key falls back to the peer address, which is still
+        # within its own allowance
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        conn.request("GET", "/extract?url=http://v", headers={"X-API-Key": "forged"})
+        resp = conn.getresponse()
+        resp.read()
+        assert resp.status == 200
+
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        conn.request("GET", "/extract?url=http://v", headers={"X-API-Key": "forged-2"})
+        resp = conn.getresponse()
+        resp.read()
+        assert resp.status == 429
+
+        # A different known client has its own bucket
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        conn.request(
+            "GET", "/extract?url=http://v&priority=bulk", headers={"X-API-Key": "b"}
+        )
+        resp = conn.getresponse()
+        resp.read()
+        assert resp.status == 200
+
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        conn.request("GET", "/stats")
+        resp = conn.getresponse()
+        stats = json.loads(resp.read())
+        assert stats["lanes"]["interactive"]["completed"] == 2
+        assert stats["lanes"]["interactive"]["rejected"] == 2
+        assert stats["lanes"]["bulk"]["completed"] == 1
+    finally:
+        server.shutdown()
+        thread.join()
+        scheduler.shutdown()
+
+
+def test_rest_server_conditional_get_and_gzip(monkeypatch):
+    calls = []
+    body = json.dumps({"title": "Soup", "steps": ["Boil the water"] * 50})
+
+    def fake_extract(url, language, fmt):
+        calls.append(url)
+        return body
+
+    monkeypatch.setattr(recipe_extractor, "extract_recipe", fake_extract)
+
+    scheduler = recipe_extractor.FairScheduler(1)
+    server = recipe_extractor.run_rest_server(
+        "127.0.0.1",
+        0,
+        serve_forever=False,
+        scheduler=scheduler,
+        cache_control="public, max-age=60",
+    )
+    port = server.server_address[1]
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        # A single keep-alive connection serves every request
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        conn.request("GET", "/extract?url=http://v")
+        resp = conn.getresponse()
+        assert resp.read().decode() == body
+        assert resp.getheader("Content-Length") == str(len(body))
+        assert resp.getheader("Cache-Control") == "public, max-age=60"
+        etag = resp.getheader("ETag")
+
+        conn.request("GET", "/extract?url=http://v", headers={"If-None-Match": etag})
+        resp = conn.getresponse()
+        assert resp.status == 304
+        assert resp.read() == b""
+        assert resp.getheader("ETag") == etag
+
+        conn.request("GET", "/extract?url=http://v", headers={"Accept-Encoding": "gzip"})
+        resp = conn.getresponse()
+        compressed = resp.read()
+        assert resp.getheader("Content-Encoding") == "gzip"
+        assert resp.getheader("Vary") == "Accept-Encoding"
+        assert gzip.decompress(compressed).decode() == body
+        assert len(compressed) < len(body)
+        assert resp.getheader("ETag") != etag
+    finally:
+        server.shutdown()
+        thread.join()
+        server.scheduler.shutdown()
+
+
+def test_rest_server_serves_cached_recipes_without_extracting(monkeypatch):
+    def fake_extract(url, language, fmt):
+        raise AssertionError("pipeline should not run for cached recipes")
+
+    monkeypatch.setattr(recipe_extractor, "extract_recipe", fake_extract)
+    cache = recipe_extractor.RecipeCache()
+    cache.put("http://v", "english", recipe_extractor.Recipe(title="Soup"))
+    monkeypatch.setattr(recipe_extractor, "RECIPE_CACHE", cache)
+
+    scheduler = recipe_extractor.FairScheduler(2, rate=0.001, burst=1)
+    server = recipe_extractor.run_rest_server(
+        "127.0.0.1", 0, serve_forever=False, scheduler=scheduler
+    )
+    port = server.server_address[1]
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        conn.request("GET", "/extract?url=http://v&format=markdown")
+        resp = conn.getresponse()
+        assert resp.status == 200
+        assert resp.read().decode().startswith("# Soup")
+        assert resp.getheader("Content-Type") == "text/markdown; charset=utf-8"
+
+        # Cache hits still spend the client's rate-limit tokens
+        conn.request("GET", "/extract?url=http://v&format=markdown")
+        resp = conn.getresponse()
+        resp.read()
+        assert resp.status == 429
+
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        conn.request("GET", "/stats")
+        stats = json.loads(conn.getresponse().read())
+        lanes = stats["lanes"]
+        assert lanes["interactive"]["served_from_cache"] == 1
+        assert lanes["interactive"]["rejected"] == 1
+        assert stats["recipe_cache"]["hits"] == 2
+        assert stats["recipe_cache"]["misses"] == 0
+    finally:
+        server.shutdown()
+        thread.join()
+        scheduler.shutdown()
+
+
+def test_rest_server_answers_from_recipe_store(tmp_path, monkeypatch):
+    from corpus import RecipeStore
+
+    def fake_extract(url, language, fmt):
+        raise AssertionError("pipeline should not run for stored recipes")
+
+    store = RecipeStore(tmp_path)
+    store.save_transcript("http://v", "transcript")
+    store.save_recipe(
+        "http://v",
+        "english",
+        recipe_extractor.Recipe(title="Stew"),
+        recipe_extractor.EXTRACTION_VERSION,
+    )
+    monkeypatch.setattr(recipe_extractor, "extract_recipe", fake_extract)
+    monkeypatch.setattr(recipe_extractor, "RECIPE_CACHE", recipe_extractor.RecipeCache())
+    monkeypatch.setattr(recipe_extractor, "RECIPE_STORE", store)
+
+    scheduler = recipe_extractor.FairScheduler(1)
+    server = recipe_extractor.run_rest_server(
+        "127.0.0.1", 0, serve_forever=False, scheduler=scheduler
+    )
+    port = server.server_address[1]
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        conn.request("GET", "/extract?url=http://v")
+        resp = conn.getresponse()
+        etag = resp.getheader("ETag")
+        assert json.loads(resp.read())["title"] == "Stew"
+
+        # After a restart the cache is empty, but revalidation is still cheap
+        recipe_extractor.RECIPE_CACHE.clear()
+        conn.request("GET", "/extract?url=http://v", headers={"If-None-Match": etag})
+        resp = conn.getresponse()
+        resp.read()
+        assert resp.status == 304
+    finally:
+        server.shutdown()
+        thread.join()
+        server.scheduler.shutdown()
+
+
+def test_rest_server_rejects_bad_query_values_without_reflecting_them():
+    scheduler = recipe_extractor.FairScheduler(1)
+    server = recipe_extractor.run_rest_server(
+        "127.0.0.1", 0, serve_forever=False, scheduler=scheduler
+    )
+    port = server.server_address[1]
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        conn.request("GET", "/extract?url=x&priority=%0d%0aSet-Cookie:%20pwned=1")
+        resp = conn.getresponse()
+        payload = json.loads(resp.read())
+        assert resp.status == 400
+        assert resp.reason == "Bad Request"
+        assert resp.getheader("Set-Cookie") is None
+        assert payload["error"] == "Invalid priority: \r\nSet-Cookie: pwned=1"
+
+        conn.request("GET", "/extract?url=x&priority=%E2%9C%93")
+        resp = conn.getresponse()
+        resp.read()
+        assert resp.status == 400
+
+        conn.request("GET", "/extract?url=x&format=%0d%0aSet-Cookie:%20pwned=1")
+        resp = conn.getresponse()
+        payload = json.loads(resp.read())
+        assert resp.status == 400
+        assert resp.getheader("Set-Cookie") is None
+        assert payload["error"] == "Invalid format: \r\nSet-Cookie: pwned=1"
+    finally:
+        server.shutdown()
+        thread.join()
+        scheduler.shutdown()
@@ -1,4 +1,5 @@
 import importlib.util
+import json
 import sys
 import types
 import os
@@ -62,3 +63,149 @@ def test_main_only_uses_youtube_transcripts(tmp_path, monkeypatch):
     ])
     recipe_extractor.main()
     assert calls["yt"] == 0
+
+
+def test_extract_recipe_reuses_cached_recipe_across_formats(monkeypatch):
+    calls = []
+    sample = {
+        "title": "Soup",
+        "ingredients": ["water"],
+        "steps": ["Boil"],
+        "tips": [],
+        "servings": "1",
+        "healthiness": {"indicator": "healthy", "rationale": "Water"},
+    }
+
+    def fake_extract_object(url, language="english", save_transcript=None):
+        calls.append(url)
+        return recipe_extractor.Recipe.from_dict(sample)
+
+    monkeypatch.setattr(recipe_extractor, "extract_recipe_object", fake_extract_object)
+    monkeypatch.setattr(recipe_extractor, "RECIPE_CACHE", recipe_extractor.RecipeCache())
+
+    assert json.loads(recipe_extractor.extract_recipe("http://v", "english", "json")) == sample
+    assert recipe_extractor.extract_recipe("http://v", "english", "markdown").startswith("# Soup")
+    assert "<h1>Soup</h1>" in recipe_extractor.extract_recipe("http://v", "english", "html")
+    assert calls == ["http://v"]
+
+
+def test_stored_transcript_skips_download(tmp_path, monkeypatch):
+    from corpus import RecipeStore
+
+    store = RecipeStore(tmp_path)
+    store.save_transcript("http://v", "post\n\nstored transcript", "stored transcript")
+    monkeypatch.setattr(recipe_extractor, "RECIPE_STORE", store)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("video pipeline should not run")
+
+    monkeypatch.setattr(recipe_extractor, "extract_video_transcript_parts", fail)
+    seen = []
+    monkeypatch.setattr(
+        recipe_extractor,
+        "extract_recipe_with_gpt",
+        lambda t, l: seen.append(t) or '{"title": "Soup"}',
+    )
+
+    saved = tmp_path / "saved.txt"
+    recipe = recipe_extractor.extract_recipe_object("http://v", save_transcript=str(saved))
+    assert recipe.title == "Soup"
+    assert saved.read_text(encoding="utf-8") == "stored transcript"
+    assert seen == ["post\n\nstored transcript"]
+    _, version = store.load_recipe("http://v", "english")
+    assert version == recipe_extractor.EXTRACTION_VERSION
+
+
+def test_save_transcript_matches_with_and_without_store(tmp_path, monkeypatch):
+    from corpus import RecipeStore
+
+    store = RecipeStore(tmp_path / "store")
+    monkeypatch.setattr(recipe_extractor, "RECIPE_STORE", store)
+    monkeypatch.setattr(
+        recipe_extractor,
+        "extract_video_transcript_parts",
+        lambda url: ("post\n\nspoken words", "spoken words"),
+    )
+    monkeypatch.setattr(
+        recipe_extractor, "extract_recipe_with_gpt", lambda t, l: '{"title": "Soup"}'
+    )
+
+    fresh = tmp_path / "fresh.txt"
+    recipe_extractor.extract_recipe_object("http://v", save_transcript=str(fresh))
+    stored = tmp_path / "stored.txt"
+    recipe_extractor.extract_recipe_object("http://v", save_transcript=str(stored))
+
+    assert fresh.read_text(encoding="utf-8") == "spoken words"
+    assert stored.read_text(encoding="utf-8") == "spoken words"
+    assert store.load_transcript("http://v") == "post\n\nspoken words"
+
+
+def test_audio_stage_runs_in_pool_when_configured(monkeypatch):
+    jobs = []
+
+    class FakePool:
+        def run(self, fn, *args):
+            jobs.append((fn, args))
+            Path(args[1]).write_bytes(b"audio")
+
+    transcribed = []
+
+    def fake_transcribe(path):
+        transcribed.append(Path(path).read_bytes())
+        return "pooled transcript"
+
+    monkeypatch.setattr(video_transcripts, "AUDIO_POOL", FakePool())
+    monkeypatch.setattr(video_transcripts, "AUDIO_CACHE", None)
+    monkeypatch.setattr(video_transcripts, "fetch_video_info", lambda url: {"id": "x"})
+    monkeypatch.setattr(video_transcripts, "transcribe_whisper", fake_transcribe)
+
+    combined = video_transcripts.extract_video_transcript("https://instagram.com/reel/x")
+
+    assert combined == "pooled transcript"
+    # Only the download runs in the pool; Whisper runs in this process
+    fn, (url, out_file) = jobs[0]
+    assert fn is video_transcripts.download_audio_with_ytdlp
+    assert url == "https://instagram.com/reel/x"
+    assert out_file != video_transcripts.AUDIO_FILE
+    assert transcribed == [b"audio"]
+    assert not Path(out_file).exists()
+
+
+def test_audio_cache_skips_download_on_retry(tmp_path, monkeypatch):
+    from audio_cache import AudioCache
+
+    downloads = []
+
+    def fake_download(url, out_file):
+        downloads.append(url)
+        Path(out_file).write_bytes(b"audio")
+
+    attempts = {"n": 0}
+
+    def flaky_transcribe(path):
+        attempts["n"] += 1
+        assert Path(path).read_bytes() == b"audio"
+        if attempts["n"] == 1:
+            raise RuntimeError("whisper failed")
+        return "spoken words"
+
+    cache = AudioCache(tmp_path / "audio", max_bytes=1024)
+    monkeypatch.setattr(video_transcripts, "AUDIO_CACHE", cache)
+    monkeypatch.setattr(video_transcripts, "AUDIO_POOL", None)
+    monkeypatch.setattr(
+        video_transcripts, "fetch_video_info", lambda url: {"id": "xyz", "extractor_key": "Instagram"}
+    )
+    monkeypatch.setattr(video_transcripts, "download_audio_with_ytdlp", fake_download)
+    monkeypatch.setattr(video_transcripts, "transcribe_whisper", flaky_transcribe)
+
+    url = "https://instagram.com/reel/xyz"
+    try:
+        video_transcripts.extract_video_transcript(url)
+    except RuntimeError:
+        pass
+    assert video_transcripts.extract_video_transcript(url) == "spoken words"
+
+    assert downloads == [url]
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["bytes_saved"] == len(b"audio")
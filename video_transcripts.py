@@ -1,6 +1,8 @@
 import yt_dlp
 import openai
 import os
+import tempfile
+import uuid
 from urllib.parse import urlparse
 from dotenv import load_dotenv
 
@@ -14,6 +16,14 @@ load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 AUDIO_FILE = "audio.mp3"
 
+AUDIO_FORMAT = "mp3"
+
+# Process pool for the audio stage, set up by the servers (see audio_pool.py)
+AUDIO_POOL = None
+
+# Optional downloaded-audio cache, enabled with --audio-cache (see audio_cache.py)
+AUDIO_CACHE = None
+
 
 def is_youtube_url(url: str) -> bool:
     """Return True if the URL points to YouTube."""
@@ -30,7 +40,7 @@ def download_audio_with_ytdlp(url: str, out_file: str = AUDIO_FILE) -> None:
         "postprocessors": [
             {
                 "key": "FFmpegExtractAudio",
-                "preferredcodec": "mp3",
+                "preferredcodec": AUDIO_FORMAT,
                 "preferredquality": "192",
             }
         ],
@@ -119,12 +129,81 @@ def transcribe_whisper(file_path: str) -> str:
     return transcript.text
 
 
-def extract_video_transcript(url: str, *, save_transcript: str | None = None) -> str:
-    """Return combined post text and transcript for a video URL."""
+def _temp_audio_file() -> str:
+    return os.path.join(tempfile.gettempdir(), f"recipe-audio-{uuid.uuid4().hex}.{AUDIO_FORMAT}")
+
+
+def download_audio(url: str, out_file: str) -> None:
+    """Download a video's audio to ``out_file``, in :data:`AUDIO_POOL` if set.
+
+    Only the download and ffmpeg conversion are CPU work worth a separate
+    process; Whisper is a network call and stays in the caller's process.
+    """
+    print("⬇️  Downloading audio...")
+    if AUDIO_POOL is not None:
+        AUDIO_POOL.run(download_audio_with_ytdlp, url, out_file)
+    else:
+        download_audio_with_ytdlp(url, out_file)
+
+
+def transcribe_downloaded_audio(url: str) -> str:
+    """Download a video's audio to a private temp file and transcribe it."""
+    # Concurrent requests each need their own audio file
+    out_file = _temp_audio_file()
+    try:
+        download_audio(url, out_file)
+        print("🎙️  Transcribing audio...")
+        return transcribe_whisper(out_file)
+    finally:
+        try:
+            os.remove(out_file)
+        except OSError:
+            pass
+
+
+def audio_cache_key(info: dict) -> str | None:
+    """Return the audio cache key for a video, or None if it has no ID."""
+    video_id = info.get("id")
+    if not video_id:
+        return None
+    # IDs are only unique per site, so prefix them with the extractor
+    extractor = info.get("extractor_key") or info.get("extractor") or "video"
+    return f"{extractor}-{video_id}"
+
+
+def transcribe_cached_audio(url: str, key: str) -> str:
+    """Transcribe a video's audio, downloading it only on an audio cache miss.
+
+    The audio is cached before transcription so a failed Whisper call can be
+    retried without downloading again.
+    """
+    out_file = _temp_audio_file()
+    try:
+        if AUDIO_CACHE.fetch(key, AUDIO_FORMAT, out_file):
+            print(f"📦 Using cached audio for {key}")
+        else:
+            download_audio(url, out_file)
+            AUDIO_CACHE.put(key, AUDIO_FORMAT, out_file)
+        print("🎙️  Transcribing audio...")
+        return transcribe_whisper(out_file)
+    finally:
+        try:
+            os.remove(out_file)
+        except OSError:
+            pass
+
+
+def extract_video_transcript_parts(url: str) -> tuple[str, str | None]:
+    """Return ``(combined, spoken)`` for a video URL.
+
+    ``combined`` is the post text and transcript fed to the model; ``spoken``
+    is the raw Whisper transcript, or ``None`` when existing captions were used.
+    """
     info = fetch_video_info(url)
     post_text = get_post_text(info)
 
     transcript = None
+    spoken = None
     if is_youtube_url(url):
         caption_langs = get_caption_languages(info)
         transcript = get_youtube_transcript(info.get("id"), caption_langs)
@@ -132,13 +211,17 @@ def extract_video_transcript(url: str, *, save_transcript: str | None = None) ->
             print("📝 Using existing YouTube transcript")
 
     if not transcript:
-        print("⬇️  Downloading audio...")
-        download_audio_with_ytdlp(url)
-        print("🎙️  Transcribing audio...")
-        transcript = transcribe_whisper(AUDIO_FILE)
-        if save_transcript:
-            with open(save_transcript, "w", encoding="utf-8") as f:
-                f.write(transcript)
+        cache_key = audio_cache_key(info) if AUDIO_CACHE is not None else None
+        if cache_key:
+            transcript = transcribe_cached_audio(url, cache_key)
+        elif AUDIO_POOL is not None:
+            transcript = transcribe_downloaded_audio(url)
+        else:
+            print("⬇️  Downloading audio...")
+            download_audio_with_ytdlp(url)
+            print("🎙️  Transcribing audio...")
+            transcript = transcribe_whisper(AUDIO_FILE)
+        spoken = transcript
 
     try:
         os.remove(AUDIO_FILE)
@@ -146,4 +229,13 @@ def extract_video_transcript(url: str, *, save_transcript: str | None = None) ->
         pass
 
     combined = (post_text + "\n\n" + transcript).strip()
+    return combined, spoken
+
+
+def extract_video_transcript(url: str, *, save_transcript: str | None = None) -> str:
+    """Return combined post text and transcript for a video URL."""
+    combined, spoken = extract_video_transcript_parts(url)
+    if save_transcript and spoken is not None:
+        with open(save_transcript, "w", encoding="utf-8") as f:
+            f.write(spoken)
     return combined